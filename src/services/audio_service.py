@@ -5,14 +5,29 @@ This module provides:
 - PyAV audio frame processing
 - Voice Activity Detection (VAD)
 - Audio chunking and buffering
-- WAV format conversion
+- WAV/FLAC format conversion
+- Memory-mapped WAV file persistence
 """
 
+import io
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
 import numpy as np
 import av
-from typing import Optional
 
-from src.utils.audio_utils import calculate_rms, pcm16_to_wav_bytes
+from src.utils.audio_utils import (
+    WAV_HEADER_SIZE,
+    build_wav_header,
+    calculate_rms,
+    pcm16_to_wav_bytes,
+)
+
+# RIFF and data chunk sizes, patched in place after every MappedWavWriter append
+_WAV_SIZE_FIELD = struct.Struct("<I")
 
 
 def process_audio_frame(frame: av.AudioFrame, gain: float = 1.0) -> np.ndarray:
@@ -73,11 +88,23 @@ def process_audio_frame(frame: av.AudioFrame, gain: float = 1.0) -> np.ndarray:
 
     # Apply volume gain with clipping to prevent distortion
     if gain != 1.0:
-        # Convert to float for accurate multiplication
-        pcm_float = pcm.astype(np.float32)
-        pcm_float *= gain
-        # Clip to prevent overflow and distortion
-        pcm = np.clip(pcm_float, -32768, 32767).astype(np.int16)
+        if gain > 1.0 and float(gain).is_integer():
+            # Integer gain (e.g. 2.0): saturate in int16 first so the
+            # multiply cannot overflow, avoiding any wider temporary. Bounds
+            # are int16 scalars; Python ints make NumPy re-check casting
+            # rules on every call, which costs more than the clip itself.
+            # Both bounds round toward zero: -32768 // 3 floors to -10923,
+            # and -10923 * 3 would wrap to a full-scale positive sample
+            factor = int(gain)
+            pcm = pcm.clip(np.int16(-(32768 // factor)), np.int16(32767 // factor))
+            pcm *= np.int16(factor)
+        else:
+            # Convert to float for accurate multiplication
+            pcm_float = pcm.astype(np.float32)
+            pcm_float *= gain
+            # Clip to prevent overflow and distortion
+            np.clip(pcm_float, -32768, 32767, out=pcm_float)
+            pcm = pcm_float.astype(np.int16)
 
     return pcm
 
@@ -135,11 +162,103 @@ def create_wav_chunk(pcm_data: np.ndarray, sample_rate: int = 48000) -> bytes:
     return pcm16_to_wav_bytes(pcm_data, sample_rate)
 
 
+def create_flac_chunk(pcm_data: np.ndarray, sample_rate: int = 48000) -> bytes:
+    """
+    Encode PCM samples as a complete in-memory FLAC file.
+
+    Args:
+        pcm_data: 1D NumPy array of int16 PCM samples
+        sample_rate: Sample rate in Hz (default: 48000)
+
+    Returns:
+        Complete FLAC file as bytes
+
+    Example:
+        >>> flac_bytes = create_flac_chunk(pcm, 48000)
+        >>> # Send flac_bytes to OpenAI API with a ".flac" filename
+
+    Notes:
+        - Lossless; speech typically compresses to 50-70% of the WAV size
+        - Uses the FLAC encoder bundled with PyAV (FFmpeg)
+        - Accepted by the OpenAI Audio Transcription API
+    """
+    buffer = io.BytesIO()
+    write_flac_chunk(buffer, pcm_data, sample_rate)
+    return buffer.getvalue()
+
+
+def write_flac_chunk(
+    output: BinaryIO, pcm_data: np.ndarray, sample_rate: int = 48000
+) -> None:
+    """
+    Encode PCM samples as a FLAC file into a caller-provided binary stream.
+
+    Lets callers reuse one buffer across chunks instead of allocating a new
+    BytesIO and bytes copy per encode. The stream is left open.
+    """
+    with av.open(output, mode="w", format="flac") as container:
+        stream = container.add_stream("flac", rate=sample_rate)
+        stream.codec_context.layout = "mono"
+
+        frame = av.AudioFrame.from_ndarray(
+            np.ascontiguousarray(pcm_data, dtype=np.int16).reshape(1, -1),
+            format="s16",
+            layout="mono",
+        )
+        frame.sample_rate = sample_rate
+
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+def resample_pcm(pcm_data: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Resample mono int16 PCM to a new sample rate.
+
+    Args:
+        pcm_data: 1D NumPy array of int16 PCM samples
+        source_rate: Sample rate of pcm_data in Hz
+        target_rate: Desired output sample rate in Hz
+
+    Returns:
+        1D NumPy array of int16 PCM samples at target_rate
+
+    Example:
+        >>> pcm_16k = resample_pcm(pcm_48k, 48000, 16000)
+        >>> len(pcm_16k) == len(pcm_48k) // 3
+        True
+
+    Notes:
+        - Uses FFmpeg's swresample via PyAV, which low-pass filters before
+          decimating so content above the new Nyquist frequency does not alias
+        - Each call is independent (resampler is flushed), suited to
+          self-contained chunks such as transcription uploads
+    """
+    if source_rate == target_rate or len(pcm_data) == 0:
+        return pcm_data
+
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=target_rate)
+    frame = av.AudioFrame.from_ndarray(
+        np.ascontiguousarray(pcm_data, dtype=np.int16).reshape(1, -1),
+        format="s16",
+        layout="mono",
+    )
+    frame.sample_rate = source_rate
+
+    out_frames = resampler.resample(frame) + resampler.resample(None)
+    if not out_frames:
+        return np.empty(0, dtype=np.int16)
+    return np.concatenate([f.to_ndarray().reshape(-1) for f in out_frames])
+
+
 def is_voiced_chunk(
     pcm_data: np.ndarray,
     rms_threshold: int,
     min_density: float = 0.08,
     amplitude_gate: int = 800,
+    rms: Optional[float] = None,
 ) -> bool:
     """
     Combined VAD using RMS and amplitude density.
@@ -147,17 +266,56 @@ def is_voiced_chunk(
     Heuristics:
     - Global RMS must exceed threshold
     - At least `min_density` of samples must exceed `amplitude_gate`
+
+    Pass `rms` when the caller has already computed it for the chunk.
     """
     if pcm_data.size == 0:
         return False
 
-    rms = calculate_rms(pcm_data)
+    if rms is None:
+        rms = calculate_rms(pcm_data)
     if rms < float(rms_threshold):
         return False
 
-    abs_vals = np.abs(pcm_data.astype(np.int32))
-    density = float(np.mean(abs_vals >= int(amplitude_gate)))
-    return density >= float(min_density)
+    # Compare in int16 on both sides of zero instead of widening and abs()
+    gate = int(amplitude_gate)
+    loud = np.count_nonzero((pcm_data >= gate) | (pcm_data <= -gate))
+    return loud >= float(min_density) * pcm_data.size
+
+
+def find_quiet_split(
+    pcm_data: np.ndarray,
+    sample_rate: int = 48000,
+    search_secs: float = 0.5,
+    frame_ms: int = 20,
+    rms_threshold: float = 300.0,
+) -> int:
+    """
+    Find where to end a chunk so the cut falls in a pause rather than a word.
+
+    Scans the last `search_secs` of audio in `frame_ms` frames and returns the
+    sample index in the middle of the quietest frame, provided that frame's
+    RMS is below `rms_threshold`. Otherwise returns len(pcm_data), i.e. keep
+    the whole chunk.
+
+    Example:
+        >>> split = find_quiet_split(chunk, 48000)
+        >>> send(chunk[:split])  # chunk[split:] starts the next chunk
+    """
+    frame = int(sample_rate * frame_ms / 1000)
+    if frame <= 0:
+        return len(pcm_data)
+    frames = min(int(search_secs * 1000 / frame_ms), len(pcm_data) // frame)
+    if frames == 0:
+        return len(pcm_data)
+
+    start = len(pcm_data) - frames * frame
+    tail = pcm_data[start:].astype(np.float64).reshape(frames, frame)
+    energy = np.einsum("ij,ij->i", tail, tail)
+    quietest = int(np.argmin(energy))
+    if energy[quietest] >= float(rms_threshold) ** 2 * frame:
+        return len(pcm_data)
+    return start + quietest * frame + frame // 2
 
 
 class AudioChunker:
@@ -275,3 +433,196 @@ class AudioChunker:
             if not (50 <= vad_rms <= 1000):
                 raise ValueError(f"vad_rms must be between 50 and 1000, got {vad_rms}")
             self.vad_rms = vad_rms
+
+
+class PcmRingBuffer:
+    """
+    Preallocated int16 ring buffer with one producer and independent readers.
+
+    The producer copies each frame into a fixed NumPy array and then
+    publishes a monotonic ``write_index``. Each consumer keeps its own read
+    index and pulls everything written since, so no locks, queues, or
+    per-frame allocations are needed on the realtime audio path.
+
+    Example:
+        >>> ring = PcmRingBuffer(48000 * 60)
+        >>> ring.write(pcm)                       # audio callback
+        >>> chunk, read_index, dropped = ring.read(read_index)  # worker
+
+    Notes:
+        - Single producer only; Python int assignment is atomic under the GIL
+        - Readers lagging more than ``capacity`` samples lose the oldest audio
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Allocate the ring.
+
+        Args:
+            capacity: Number of int16 samples retained before overwrite
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.write_index = 0  # Total samples ever written
+        self._buffer = np.zeros(capacity, dtype=np.int16)
+
+    def write(self, pcm_data: np.ndarray) -> None:
+        """
+        Append samples, overwriting the oldest data when full.
+
+        Args:
+            pcm_data: 1D NumPy array of int16 PCM samples
+        """
+        count = len(pcm_data)
+        if count == 0:
+            return
+
+        write_index = self.write_index
+        if count > self.capacity:
+            # Only the newest capacity samples can be kept
+            write_index += count - self.capacity
+            pcm_data = pcm_data[-self.capacity:]
+            count = self.capacity
+
+        start = write_index % self.capacity
+        first = min(count, self.capacity - start)
+        self._buffer[start:start + first] = pcm_data[:first]
+        if first < count:
+            self._buffer[:count - first] = pcm_data[first:]
+
+        # Publish only after the samples are in place
+        self.write_index = write_index + count
+
+    def read(
+        self,
+        read_index: int,
+        out: Optional[np.ndarray] = None,
+    ) -> tuple[np.ndarray, int, int]:
+        """
+        Copy all samples written since read_index.
+
+        Args:
+            read_index: Consumer position returned by the previous read
+            out: Optional preallocated int16 staging array. When it is large
+                 enough the samples are copied into it and a view is
+                 returned, otherwise a new array is allocated.
+
+        Returns:
+            Tuple of (samples, next read_index, samples dropped by overrun)
+        """
+        end = self.write_index
+        dropped = max(0, end - self.capacity - read_index)
+        start = read_index + dropped
+        if start >= end:
+            return np.empty(0, dtype=np.int16), end, dropped
+
+        begin = start % self.capacity
+        count = end - start
+        first = min(count, self.capacity - begin)
+        if out is None or len(out) < count:
+            out = np.empty(count, dtype=np.int16)
+        samples = out[:count]
+        samples[:first] = self._buffer[begin:begin + first]
+        if first < count:
+            samples[first:] = self._buffer[:count - first]
+
+        # Samples overwritten while copying are stale; drop them
+        overwritten = self.write_index - self.capacity - start
+        if overwritten > 0:
+            samples = samples[overwritten:]
+            dropped += overwritten
+
+        return samples, end, dropped
+
+    def pending(self, read_index: int) -> int:
+        """Return how many samples a read from read_index would return."""
+        return min(self.write_index - read_index, self.capacity)
+
+
+class MappedWavWriter:
+    """
+    Append-only mono 16-bit WAV file backed by a preallocated memory map.
+
+    The file is grown in large extents (default: 60 seconds of audio) and
+    mapped into memory, so each append is a memcpy into the page cache
+    instead of a buffered write that periodically extends the file.
+
+    Example:
+        >>> writer = MappedWavWriter(Path("resource/recording.wav"), 48000)
+        >>> writer.write(pcm_array)  # int16 ndarray or raw bytes
+        >>> writer.close()           # trims preallocated tail
+
+    Notes:
+        - Header sizes are patched after every append, so the file stays a
+          valid WAV (followed by zero padding) if the process dies
+        - Not thread-safe: use from a single writer thread
+    """
+
+    def __init__(self, path: Path, sample_rate: int = 48000, extent_secs: float = 60.0):
+        """
+        Create the file and map the first extent.
+
+        Args:
+            path: Destination WAV path (truncated if it exists)
+            sample_rate: Sample rate in Hz written to the header
+            extent_secs: Seconds of audio reserved per file growth step
+        """
+        self.path = Path(path)
+        self.sample_rate = sample_rate
+        self.data_size = 0
+        self._extent_bytes = max(int(sample_rate * extent_secs) * 2, mmap.PAGESIZE)
+        self._fd: Optional[int] = os.open(
+            str(self.path), os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644
+        )
+        self._mmap: Optional[mmap.mmap] = None
+        self._capacity = 0
+        self._reserve(WAV_HEADER_SIZE + self._extent_bytes)
+        self._mmap[:WAV_HEADER_SIZE] = build_wav_header(0, sample_rate)
+
+    def _reserve(self, size: int) -> None:
+        """Grow the file to size bytes and remap it."""
+        if self._mmap is not None:
+            self._mmap.close()
+        try:
+            os.posix_fallocate(self._fd, 0, size)
+        except (AttributeError, OSError):
+            # macOS/Windows or filesystems without fallocate support
+            os.ftruncate(self._fd, size)
+        self._mmap = mmap.mmap(self._fd, size)
+        self._capacity = size
+
+    def write(self, pcm_data: Union[np.ndarray, bytes]) -> None:
+        """
+        Append PCM samples to the data chunk.
+
+        Args:
+            pcm_data: C-contiguous int16 NumPy array or raw PCM16 bytes
+        """
+        if self._mmap is None:
+            raise ValueError("MappedWavWriter is closed")
+
+        payload = memoryview(pcm_data).cast("B")
+        start = WAV_HEADER_SIZE + self.data_size
+        end = start + payload.nbytes
+        if end > self._capacity:
+            self._reserve(end + self._extent_bytes)
+
+        self._mmap[start:end] = payload
+        self.data_size += payload.nbytes
+        _WAV_SIZE_FIELD.pack_into(self._mmap, 4, 36 + self.data_size)
+        _WAV_SIZE_FIELD.pack_into(self._mmap, 40, self.data_size)
+
+    def close(self) -> None:
+        """Flush the mapping and trim the file to header + written data."""
+        if self._fd is None:
+            return
+        try:
+            if self._mmap is not None:
+                self._mmap.flush()
+                self._mmap.close()
+                self._mmap = None
+            os.ftruncate(self._fd, WAV_HEADER_SIZE + self.data_size)
+        finally:
+            os.close(self._fd)
+            self._fd = None
@@ -8,13 +8,17 @@ UI updates with configurable prefixes so multiple instances can coexist.
 """
 
 import io
+import logging
+import math
 import os
 import queue
 import threading
 import time
 import uuid
-import wave
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -25,19 +29,52 @@ import streamlit as st
 from opencc import OpenCC
 from streamlit_webrtc import RTCConfiguration, WebRtcMode, webrtc_streamer
 
-from src.services.audio_service import process_audio_frame, is_voiced_chunk
-from src.utils.audio_utils import calculate_rms
+from src.services.audio_service import (
+    MappedWavWriter,
+    PcmRingBuffer,
+    find_quiet_split,
+    is_voiced_chunk,
+    process_audio_frame,
+    resample_pcm,
+    write_flac_chunk,
+)
+from src.utils.audio_utils import build_wav_header, calculate_rms, sum_of_squares
+
+# Per-chunk and per-segment traces; lazy %-formatting keeps them free when disabled
+logger = logging.getLogger(__name__)
 
 SAMPLE_RATE = 48000
 SAMPLE_WIDTH = 2  # bytes (int16)
+WHISPER_SAMPLE_RATE = 16000  # Whisper's native rate; uploads are downsampled to it
 ICE_SERVERS = [{"urls": ["stun:stun.l.google.com:19302"]}]
 AUDIO_GAIN = 2.0  # Volume boost multiplier
 TRANSCRIPTION_CHUNK_DURATION = 3.0  # Seconds between transcription calls
 VAD_RMS_THRESHOLD = 300.0  # Minimum RMS to consider as speech (filter silence)
 TRANSCRIPT_REFRESH_INTERVAL_MS = 1200  # UI polling interval during recording
 TRANSCRIPT_REFRESH_INTERVAL_SECONDS = TRANSCRIPT_REFRESH_INTERVAL_MS / 1000.0
+LIVE_TRANSCRIPT_MAX_CHARS = 8000  # Tail of the transcript shown while recording
 VAD_SAMPLE_DENSITY = 0.12  # Minimum proportion of loud samples to treat as speech
 VAD_AMPLITUDE_GATE = 1100  # Sample amplitude gate used by density check
+TRANSCRIPTION_CHUNK_SAMPLES = int(SAMPLE_RATE * TRANSCRIPTION_CHUNK_DURATION)
+TRANSCRIPTION_STAGING_SAMPLES = int(TRANSCRIPTION_CHUNK_SAMPLES * 1.5)
+TRANSCRIPTION_MAX_IN_FLIGHT = 3  # Concurrent API requests per recording
+TRANSCRIPTION_REQUEST_TIMEOUT = 30.0  # Seconds before a chunk upload is abandoned
+TRANSCRIPTION_MAX_RETRIES = 2  # SDK retries per chunk upload after a failed attempt
+# Worst case for the requests still in flight at stop (they run in parallel),
+# plus one chunk of slack for the worker's last tick
+TRANSCRIPTION_FINALIZE_TIMEOUT = (
+    TRANSCRIPTION_REQUEST_TIMEOUT * (TRANSCRIPTION_MAX_RETRIES + 1)
+    + TRANSCRIPTION_CHUNK_DURATION
+)
+CHUNK_BOUNDARY_SEARCH_SECONDS = 0.5  # Tail of each chunk searched for a pause to cut at
+# Idle wait before buffered audio is flushed uncut; well past one chunk so it
+# only fires when frames stop arriving, not in a race with the chunk notify
+TRANSCRIPTION_FLUSH_TIMEOUT = TRANSCRIPTION_CHUNK_DURATION * 2
+TRANSCRIPTION_PROMPT_CHARS = 200  # Recent text sent as context (Whisper reads ~224 tokens)
+FINALIZE_POLL_INTERVAL_SECONDS = 0.5  # UI check interval while a stop is finishing
+AUDIO_RING_SECONDS = 60  # Audio retained for slow consumers before overwrite
+AUDIO_WORKER_POLL_SECONDS = 0.05  # WAV writer drain interval
+S2T_CACHE_MAX_CHARS = 64  # Short replies (names, fillers) recur; longer ones rarely do
 
 MODEL_COST_CONFIG = {
     "whisper-1": {
@@ -54,33 +91,65 @@ MODEL_COST_CONFIG = {
     },
 }
 
+# (USD per audio minute, output tokens per char, USD per output char) per model,
+# folded once so cost estimates on every refresh are plain multiplies
+_MODEL_COST_RATES: dict[str, tuple[float, float, float]] = {
+    name: (
+        float(config.get("input_cost_per_min", 0.0)),
+        float(config.get("output_tokens_per_char", 0.0)),
+        float(config.get("output_tokens_per_char", 0.0))
+        * float(config.get("output_cost_per_token", 0.0)),
+    )
+    for name, config in MODEL_COST_CONFIG.items()
+}
+_MINUTES_PER_BYTE = 1.0 / (SAMPLE_WIDTH * SAMPLE_RATE * 60.0)
+
 DEFAULT_TITLE = "🎤 即時語音轉錄"
 DEFAULT_CAPTION = "轉錄為逐字稿"
 
+# Saved transcript preamble; only the time and audio file name vary per save
+_TRANSCRIPT_HEADER_TEMPLATE = (
+    "語音轉錄結果\n"
+    "時間：{timestamp}\n"
+    "音訊檔案：{filename}\n"
+    f"採樣率：{SAMPLE_RATE} Hz\n"
+    "模型：OpenAI \n"
+    "格式：yyyy-mm-dd hh:mi:ss + 逐字稿內容\n"
+    "\n"
+    f"{'=' * 60}\n"
+    "\n"
+)
+
 # Initialize OpenCC for Simplified to Traditional Chinese conversion
 _opencc_converter = OpenCC("s2t")
 
-# Global state - using token-based system like mic_recorder_page
+# Global state - one recording per slot; tokens are opaque handles for the UI
+_MAX_SESSION_SLOTS = 2  # Active recording plus one still shutting down
 _recorder_lock = threading.Lock()
-_active_token: Optional[str] = None
-_audio_queues: dict[str, "queue.Queue"] = {}
-_transcription_buffers: dict[str, list] = {}
-_transcript_segments: dict[str, list] = {}
-_wav_writers: dict[str, wave.Wave_write] = {}
-_wav_paths: dict[str, Path] = {}
-_bytes_written: dict[str, int] = {}
-_last_rms: dict[str, float] = {}
-_worker_threads: dict[str, threading.Thread] = {}
-_worker_stop_events: dict[str, threading.Event] = {}
-_transcription_threads: dict[str, threading.Thread] = {}
-_transcription_stop_events: dict[str, threading.Event] = {}
-_last_transcription_time: dict[str, float] = {}
-_token_models: dict[str, str] = {}
-_active_model: Optional[str] = None
-
-# Cache API key check
-_api_key_checked = False
-_api_key_available = False
+_sessions: list[Optional["_TokenState"]] = [None] * _MAX_SESSION_SLOTS
+_active_slot = -1
+
+# Joins workers and saves transcripts after Stop so the UI thread never waits
+_finalizer = ThreadPoolExecutor(
+    max_workers=_MAX_SESSION_SLOTS,
+    thread_name_prefix="transcription-finalize",
+)
+
+# Upload FLAC (lossless, smaller); disabled if the local FFmpeg lacks the encoder
+_flac_upload_enabled = True
+
+# Upload buffers reused across chunks; one per concurrent API request
+_upload_buffers: "queue.LifoQueue[io.BytesIO]" = queue.LifoQueue(
+    maxsize=TRANSCRIPTION_MAX_IN_FLIGHT * _MAX_SESSION_SLOTS
+)
+
+# Shared across recordings so the HTTP connection pool stays warm
+_openai_client: Optional[Any] = None
+_openai_client_key: Optional[str] = None
+_openai_client_lock = threading.Lock()
+
+# Last formatted wall-clock second shared by the refresh fragments
+_clock_cache: tuple[int, str] = (-1, "")
 
 
 @dataclass
@@ -97,6 +166,101 @@ class TranscriptionUIConfig:
     model_name: str = "whisper-1"
 
 
+@dataclass(frozen=True)
+class _TranscriptSnapshot:
+    """Transcript text and segment count, published together as one object."""
+
+    text: str = ""
+    segment_count: int = 0
+    # Most recent transcribed words without timestamps, used as the API prompt
+    recent_text: str = ""
+
+
+@dataclass
+class _TokenState:
+    """Per-recording state shared by the audio callback and worker threads."""
+
+    token: str
+    model_name: str
+    wav_path: Path
+    ring: PcmRingBuffer = field(
+        default_factory=lambda: PcmRingBuffer(SAMPLE_RATE * AUDIO_RING_SECONDS)
+    )
+    transcription_read_index: int = 0
+    # Replaced (never mutated) by the transcription worker, one line longer
+    # per segment; readers take the reference without locking or re-joining
+    transcript: _TranscriptSnapshot = field(default_factory=_TranscriptSnapshot)
+    bytes_written: int = 0
+    # Running level totals, written only by the audio callback
+    rms_sum_squares: int = 0
+    rms_samples: int = 0
+    # Snapshot of the totals at the last UI read
+    rms_read_sum_squares: int = 0
+    rms_read_samples: int = 0
+    last_rms: float = 0.0
+    # Written by the transcription worker; while it is at the cap the callback
+    # skips wake-ups, since the worker cannot consume audio until one finishes
+    requests_in_flight: int = 0
+    chunk_ready: threading.Condition = field(default_factory=threading.Condition)
+    worker_stop: threading.Event = field(default_factory=threading.Event)
+    transcription_stop: threading.Event = field(default_factory=threading.Event)
+    worker_thread: Optional[threading.Thread] = None
+    transcription_thread: Optional[threading.Thread] = None
+
+
+@dataclass
+class _RecordingResult:
+    """Outcome of a stopped recording, produced by the finalizer thread."""
+
+    status: str
+    model_name: str
+    bytes_written: int = 0
+    transcript: str = ""
+    transcript_path: Optional[Path] = None
+    cost_info: Optional[dict[str, float]] = None
+
+
+def _get_active_state() -> Optional[_TokenState]:
+    """Return the state of the active recording without hashing the token."""
+    slot = _active_slot
+    if slot < 0:
+        return None
+    return _sessions[slot]
+
+
+def _read_input_level(token_state: _TokenState) -> float:
+    """Return the RMS of audio received since the previous status refresh."""
+    sum_squares = token_state.rms_sum_squares
+    samples = token_state.rms_samples
+    new_samples = samples - token_state.rms_read_samples
+    if new_samples > 0:
+        new_sum = max(sum_squares - token_state.rms_read_sum_squares, 0)
+        token_state.last_rms = math.sqrt(new_sum / new_samples)
+        token_state.rms_read_sum_squares = sum_squares
+        token_state.rms_read_samples = samples
+    return token_state.last_rms
+
+
+def _find_state(token: Optional[str]) -> Optional[_TokenState]:
+    """Return the state registered for token, if any."""
+    if not token:
+        return None
+    for token_state in _sessions:
+        if token_state is not None and token_state.token == token:
+            return token_state
+    return None
+
+
+def _release_state(token_state: _TokenState) -> None:
+    """Free the slot held by token_state. Caller must hold _recorder_lock."""
+    global _active_slot
+    for slot, slot_state in enumerate(_sessions):
+        if slot_state is token_state:
+            _sessions[slot] = None
+            if _active_slot == slot:
+                _active_slot = -1
+
+
 class _SessionState:
     """Wrapper around st.session_state with automatic key prefixing."""
 
@@ -130,29 +294,41 @@ class _SessionState:
             del st.session_state[session_key]
 
 
-def _format_transcript_segments(segments: list) -> str:
-    """Convert transcript segments into displayable text."""
-    formatted_lines: list[str] = []
-    for seg in segments:
-        if isinstance(seg, dict):
-            formatted_lines.append(f"{seg.get('time', '')}  {seg.get('text', '')}")
-        else:
-            formatted_lines.append(str(seg))
-    return "\n".join(formatted_lines)
+def _format_segment(time_str: str, text: str) -> str:
+    """Format one transcript segment as a display line."""
+    return f"{time_str}  {text}"
+
 
+def _clock_hms() -> str:
+    """Return the local time as HH:MM:SS, formatted at most once per second."""
+    global _clock_cache
+    second = int(time.time())
+    cached_second, text = _clock_cache
+    if second != cached_second:
+        local = time.localtime(second)
+        text = f"{local.tm_hour:02d}:{local.tm_min:02d}:{local.tm_sec:02d}"
+        _clock_cache = (second, text)
+    return text
 
-def _get_model_config(model_name: str) -> dict[str, Any]:
-    """Return cost configuration for given model."""
-    return MODEL_COST_CONFIG.get(model_name, MODEL_COST_CONFIG["whisper-1"])
+
+def _transcript_tail(transcript: str) -> str:
+    """Return the last LIVE_TRANSCRIPT_MAX_CHARS of a transcript on a line boundary."""
+    if len(transcript) <= LIVE_TRANSCRIPT_MAX_CHARS:
+        return transcript
+    tail = transcript[-LIVE_TRANSCRIPT_MAX_CHARS:]
+    return tail[tail.find("\n") + 1:]
+
+
+def _get_model_rates(model_name: str) -> tuple[float, float, float]:
+    """Return precomputed cost rates for given model."""
+    return _MODEL_COST_RATES.get(model_name, _MODEL_COST_RATES["whisper-1"])
 
 
 def _audio_minutes_from_bytes(byte_count: int) -> float:
     """Convert byte count to minutes based on mono int16 PCM."""
     if byte_count <= 0:
         return 0.0
-    frames = byte_count / SAMPLE_WIDTH
-    seconds = frames / SAMPLE_RATE
-    return seconds / 60.0
+    return byte_count * _MINUTES_PER_BYTE
 
 
 def _estimate_transcription_cost(
@@ -162,13 +338,12 @@ def _estimate_transcription_cost(
     transcript_text: str,
 ) -> dict[str, float]:
     """Estimate transcription cost based on audio duration and text length."""
-    config = _get_model_config(model_name)
-    input_cost = float(audio_minutes) * float(config.get("input_cost_per_min", 0.0))
+    cost_per_min, tokens_per_char, cost_per_char = _get_model_rates(model_name)
+    input_cost = audio_minutes * cost_per_min
 
     char_count = len(transcript_text or "")
-    tokens_per_char = float(config.get("output_tokens_per_char", 0.0))
     output_tokens = char_count * tokens_per_char
-    output_cost = output_tokens * float(config.get("output_cost_per_token", 0.0))
+    output_cost = char_count * cost_per_char
 
     total_cost = input_cost + output_cost
 
@@ -211,19 +386,23 @@ def _calculate_cost_snapshot(
     if not token:
         return fallback_model, None, "", 0
 
-    with _recorder_lock:
-        model_name = _token_models.get(token, fallback_model)
-        bytes_written = _bytes_written.get(token, 0)
-        segments = list(_transcript_segments.get(token, []))
+    model_name = fallback_model
+    bytes_written = 0
+    snapshot = _TranscriptSnapshot()
+    token_state = _find_state(token)
+    if token_state is not None:
+        model_name = token_state.model_name
+        bytes_written = token_state.bytes_written
+        snapshot = token_state.transcript
 
-    transcript_text = _format_transcript_segments(segments)
+    transcript_text = snapshot.text
     audio_minutes = _audio_minutes_from_bytes(bytes_written)
     cost_info = _estimate_transcription_cost(
         model_name,
         audio_minutes=audio_minutes,
         transcript_text=transcript_text,
     )
-    return model_name, cost_info, transcript_text, len(segments)
+    return model_name, cost_info, transcript_text, snapshot.segment_count
 
 
 def render_transcription_widget(
@@ -273,6 +452,7 @@ def _render_transcription_ui(config: TranscriptionUIConfig, state: _SessionState
     state.ensure("last_path", "")
     state.ensure("segment_count", 0)
     state.ensure("last_segment_count", 0)
+    state.ensure("finalize_future", None)
     state.ensure("mic_permission_requested", False)
     state.ensure("model_name", config.model_name)
     state.ensure("last_model_name", config.model_name)
@@ -289,27 +469,22 @@ def _render_transcription_ui(config: TranscriptionUIConfig, state: _SessionState
         if config.caption:
             st.caption(config.caption)
 
-    global _api_key_checked, _api_key_available
-    if not _api_key_checked:
-        _api_key_available = _check_api_key()
-        _api_key_checked = True
-
     if not _api_key_available:
         _render_api_key_input(state)
         return
 
+    _apply_finished_recording(state)
+
     _render_controls(config, state)
     _render_webrtc_stream(config, state)
-    _render_status(state)
-    _render_transcript_display(config, state)
+    _render_recording_view(config, state)
 
 
 def _check_api_key() -> bool:
-    """Check for API key in environment (only once)."""
+    """Check for API key in environment, falling back to the .env file."""
     if os.getenv("OPENAI_API_KEY"):
         return True
 
-    # Try loading from .env file (only once)
     try:
         from dotenv import load_dotenv
 
@@ -319,6 +494,29 @@ def _check_api_key() -> bool:
         return False
 
 
+# Resolved once at import so renders never touch the filesystem; set to True
+# when the key is entered in the UI
+_api_key_available = _check_api_key()
+
+
+def _get_openai_client() -> Any:
+    """Return the process-wide OpenAI client, rebuilding it if the API key changed."""
+    global _openai_client, _openai_client_key
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    with _openai_client_lock:
+        if _openai_client is None or api_key != _openai_client_key:
+            from openai import OpenAI
+
+            _openai_client = OpenAI(
+                api_key=api_key,
+                timeout=TRANSCRIPTION_REQUEST_TIMEOUT,
+                max_retries=TRANSCRIPTION_MAX_RETRIES,
+            )
+            _openai_client_key = api_key
+        return _openai_client
+
+
 def _render_api_key_input(state: _SessionState) -> None:
     """Render API key input field."""
     st.warning("⚠️ 請先設定 OpenAI API Key")
@@ -347,13 +545,14 @@ def _render_controls(config: TranscriptionUIConfig, state: _SessionState) -> Non
 
     col1, col2 = st.columns(2)
     is_active = state.get("active", False)
+    is_finalizing = state.get("finalize_future") is not None
 
     with col1:
         if st.button(
             "▶️ 開始錄音",
             type="primary",
             use_container_width=True,
-            disabled=is_active or not config.controls_enabled,
+            disabled=is_active or is_finalizing or not config.controls_enabled,
             key=state.key("start_button"),
         ):
             if config.controls_enabled:
@@ -378,36 +577,43 @@ def _render_webrtc_stream(config: TranscriptionUIConfig, state: _SessionState) -
     """Render WebRTC microphone stream."""
     st.markdown("#### 🎙️ 麥克風串流")
 
-    def audio_callback(frame: av.AudioFrame) -> av.AudioFrame:
-        global _active_token
-
-        with _recorder_lock:
-            token = _active_token
+    # Bind the per-frame globals once; the callback reads closure cells
+    # instead of doing a module dict lookup for each name 50 times a second
+    get_active_state = _get_active_state
+    process_frame = process_audio_frame
+    frame_sum_of_squares = sum_of_squares
+    gain = AUDIO_GAIN
+    chunk_samples = TRANSCRIPTION_CHUNK_SAMPLES
+    max_in_flight = TRANSCRIPTION_MAX_IN_FLIGHT
 
-        if not token:
+    def audio_callback(frame: av.AudioFrame) -> av.AudioFrame:
+        # Plain int read and list indexing: no token hashing per frame
+        token_state = get_active_state()
+        if token_state is None:
             return frame
 
         try:
             # Process audio frame with gain
-            pcm_array = process_audio_frame(frame, gain=AUDIO_GAIN)
-            pcm_bytes = pcm_array.tobytes()
-
-            # Calculate RMS
-            rms = float(calculate_rms(pcm_array))
-
-            # Add to audio queue (for WAV writer)
-            with _recorder_lock:
-                audio_queue = _audio_queues.get(token)
-                if audio_queue:
-                    try:
-                        audio_queue.put_nowait((pcm_bytes, rms))
-                    except queue.Full:
-                        pass
-
-                # Add to transcription buffer (for Whisper API)
-                transcription_buffer = _transcription_buffers.get(token)
-                if transcription_buffer is not None:
-                    transcription_buffer.append(pcm_array)
+            pcm_array = process_frame(frame, gain=gain)
+
+            # Single lock-free copy shared by the WAV and transcription workers
+            ring = token_state.ring
+            ring.write(pcm_array)
+            # Accumulate only; the status panel turns this into RMS on demand
+            token_state.rms_sum_squares += frame_sum_of_squares(pcm_array)
+            token_state.rms_samples += pcm_array.size
+
+            # Wake the transcription worker once a full chunk is buffered. With
+            # every request slot busy the backlog stays above a chunk, so
+            # notifying each frame would spin the worker at the frame rate;
+            # a finishing request wakes it instead
+            buffered = ring.write_index - token_state.transcription_read_index
+            if (
+                buffered >= chunk_samples
+                and token_state.requests_in_flight < max_in_flight
+            ):
+                with token_state.chunk_ready:
+                    token_state.chunk_ready.notify()
 
         except Exception as exc:
             print(f"[Transcription] Callback error: {exc}")
@@ -442,150 +648,166 @@ def _render_webrtc_stream(config: TranscriptionUIConfig, state: _SessionState) -
         st.warning("⚠️ 請允許瀏覽器存取麥克風權限")
 
 
-def _render_status(state: _SessionState) -> None:
-    """Render recording status."""
-    st.markdown("#### 📊 錄音狀態")
-
+def _render_recording_view(config: TranscriptionUIConfig, state: _SessionState) -> None:
+    """Render status and transcript; while recording one fragment refreshes both."""
     token = state.get("token")
     is_active = state.get("active", False)
-    current_model = state.get("model_name", "whisper-1")
-    run_interval = TRANSCRIPT_REFRESH_INTERVAL_SECONDS if is_active else None
-    state_prefix = state.prefix
 
-    @st.fragment(run_every=run_interval)
-    def _status_fragment(
-        prefix: str,
-        token_value: Optional[str],
-        model_hint: str,
-        active_flag: bool,
-    ) -> None:
+    if not (is_active and token):
+        _render_status(state)
+        _render_transcript_display(state)
+        return
+
+    current_model = state.get("model_name", config.model_name)
+
+    # A single timer per session: status and transcript share one snapshot
+    # and one cost estimate per tick instead of refreshing separately
+    @st.fragment(run_every=TRANSCRIPT_REFRESH_INTERVAL_SECONDS)
+    def _recording_fragment(prefix: str, token_value: str, model_hint: str) -> None:
         fragment_state = _SessionState(prefix)
-        bytes_written = 0
-        last_rms = 0.0
+        current_fragment_model = fragment_state.get("model_name", model_hint)
+        active_model, cost_info, transcript_text, segment_count = _calculate_cost_snapshot(
+            token_value,
+            current_fragment_model,
+        )
+        if active_model != current_fragment_model:
+            fragment_state.set("model_name", active_model)
+
+        st.markdown("#### 📊 錄音狀態")
+        _render_status_body(fragment_state, _find_state(token_value), cost_info, segment_count)
+        st.markdown("#### 📄 即時轉錄結果")
+        _render_live_transcript_body(
+            fragment_state, token_value, transcript_text, segment_count, cost_info
+        )
 
-        if token_value:
-            with _recorder_lock:
-                bytes_written = _bytes_written.get(token_value, 0)
-                last_rms = _last_rms.get(token_value, 0.0)
+    _recording_fragment(state.prefix, token, current_model)
 
-        path_str = fragment_state.get("path", "")
-        if path_str:
-            st.write(f"📁 檔案：`{path_str}`")
-        else:
-            st.write("📁 尚未開始錄音")
 
-        if bytes_written > 0:
-            duration_sec = bytes_written / (SAMPLE_RATE * SAMPLE_WIDTH)
-            st.write(f"⏱️ 已錄製：{duration_sec:.1f} 秒")
-        else:
-            st.write("⏱️ 已錄製：0.0 秒")
+def _render_status(state: _SessionState) -> None:
+    """Render recording status while not recording."""
+    st.markdown("#### 📊 錄音狀態")
+    _render_status_body(state, _find_state(state.get("token")), None, None)
 
-        st.write(f"🔊 當前 RMS：{last_rms:.1f}")
-        st.write(f"🎚️ 採樣率：{SAMPLE_RATE} Hz")
-        st.write(f"📈 音量增益：{AUDIO_GAIN}x")
 
-        cost_info = None
-        current_fragment_model = fragment_state.get("model_name", model_hint)
-        if active_flag and token_value:
-            active_model, cost_info, _, _ = _calculate_cost_snapshot(
-                token_value,
-                current_fragment_model,
-            )
-            if active_model != current_fragment_model:
-                fragment_state.set("model_name", active_model)
-                current_fragment_model = active_model
+def _render_status_body(
+    fragment_state: _SessionState,
+    token_state: Optional[_TokenState],
+    cost_info: Optional[dict[str, float]],
+    segment_count: Optional[int],
+) -> None:
+    """Render the status lines; segment_count is shown only while recording."""
+    bytes_written = 0
+    last_rms = 0.0
+    if token_state is not None:
+        bytes_written = token_state.bytes_written
+        last_rms = _read_input_level(token_state)
+
+    # Collected into one markdown element so each refresh sends a single
+    # delta instead of one per line
+    status_lines: list[str] = []
+
+    path_str = fragment_state.get("path", "")
+    if path_str:
+        status_lines.append(f"📁 檔案：`{path_str}`")
+    else:
+        status_lines.append("📁 尚未開始錄音")
 
-        if cost_info:
-            st.write(_format_cost_caption(cost_info))
-            fragment_state.set("last_cost", cost_info)
-        else:
-            last_cost = fragment_state.get("last_cost")
-            if last_cost:
-                st.write(_format_cost_caption(last_cost))
+    duration_sec = bytes_written / (SAMPLE_RATE * SAMPLE_WIDTH)
+    status_lines.append(f"⏱️ 已錄製：{duration_sec:.1f} 秒")
+    status_lines.append(f"🔊 當前 RMS：{last_rms:.1f}")
+    status_lines.append(f"🎚️ 採樣率：{SAMPLE_RATE} Hz")
+    status_lines.append(f"📈 音量增益：{AUDIO_GAIN}x")
 
-        if active_flag:
-            st.write(f"📝 已轉錄段數：{fragment_state.get('segment_count', 0)}")
+    if cost_info:
+        status_lines.append(_format_cost_caption(cost_info))
+        fragment_state.set("last_cost", cost_info)
+    else:
+        last_cost = fragment_state.get("last_cost")
+        if last_cost:
+            status_lines.append(_format_cost_caption(last_cost))
 
-    _status_fragment(state_prefix, token, current_model, is_active)
+    if segment_count is not None:
+        status_lines.append(f"📝 已轉錄段數：{segment_count}")
 
+    st.markdown("  \n".join(status_lines))
 
-def _render_transcript_display(config: TranscriptionUIConfig, state: _SessionState) -> None:
-    """Render transcript display area with st.empty() for smooth updates."""
-    st.markdown("#### 📄 即時轉錄結果")
 
-    token = state.get("token")
-    is_active = state.get("active", False)
-    state_prefix = state.prefix
+def _render_live_transcript_body(
+    fragment_state: _SessionState,
+    token_value: str,
+    current_transcript: str,
+    segment_count: int,
+    cost_info: Optional[dict[str, float]],
+) -> None:
+    """Render the transcript tail shown while recording."""
+    last_segment_count = fragment_state.get("last_segment_count", 0)
+    if segment_count != last_segment_count:
+        logger.debug(
+            "New content detected: %d segments (was %d)",
+            segment_count,
+            last_segment_count,
+        )
+        fragment_state.set("last_segment_count", segment_count)
+        fragment_state.set("segment_count", segment_count)
+
+    last_update_time = _clock_hms()
+    display_key = fragment_state.key("transcript_display_live")
+
+    if current_transcript:
+        # Text only changes when a segment lands; between responses the tail
+        # already held in session state is reused instead of rebuilt
+        shown = (token_value, segment_count)
+        if fragment_state.get("transcript_display_shown") != shown:
+            st.session_state[display_key] = _transcript_tail(current_transcript)
+            fragment_state.set("transcript_display_shown", shown)
+        caption_text = (
+            f"📊 已轉錄：{len(current_transcript)} 字元 | "
+            f"分段數：{segment_count} | 更新時間：{last_update_time}"
+        )
+    else:
+        token_preview = token_value[:8] if token_value else "N/A"
+        st.session_state[display_key] = (
+            f"🎤 等待轉錄結果...\n\n開始時間：{last_update_time}\n"
+            f"Token：{token_preview}\n\n約 3 秒後會出現第一段轉錄結果"
+        )
+        fragment_state.set("transcript_display_shown", None)
+        caption_text = (
+            f"⏳ 等待中... | 已檢查次數："
+            f"{fragment_state.get('segment_count', 0)} | "
+            f"更新時間：{last_update_time}"
+        )
 
-    # Show real-time transcript during recording
-    if is_active and token:
-        current_model = state.get("model_name", config.model_name)
-
-        @st.fragment(run_every=TRANSCRIPT_REFRESH_INTERVAL_SECONDS)
-        def _live_transcript_fragment(
-            prefix: str,
-            token_value: str,
-            model_value: str,
-        ) -> None:
-            fragment_state = _SessionState(prefix)
-            with _recorder_lock:
-                segments = list(_transcript_segments.get(token_value, []))
-
-            segment_count = len(segments)
-            last_segment_count = fragment_state.get("last_segment_count", 0)
-            has_new_content = segment_count != last_segment_count
-
-            if has_new_content:
-                print(
-                    "[Transcription UI] New content detected: "
-                    f"{segment_count} segments (was {last_segment_count})"
-                )
-                fragment_state.set("last_segment_count", segment_count)
-                fragment_state.set("segment_count", segment_count)
+    display_value = st.session_state[display_key]
+    st.text_area(
+        f"即時逐字稿 (最後更新：{last_update_time})",
+        value=display_value,
+        height=300,
+        help="格式：yyyy-mm-dd hh:mi:ss + 逐字稿內容 | 自動檢測更新",
+        key=display_key,
+    )
+    st.caption(caption_text)
 
-            current_transcript = _format_transcript_segments(segments)
-            last_update_time = datetime.now().strftime("%H:%M:%S")
+    if cost_info:
+        st.caption(_format_cost_caption(cost_info))
 
-            if current_transcript:
-                display_value = current_transcript
-                caption_text = (
-                    f"📊 已轉錄：{len(current_transcript)} 字元 | "
-                    f"分段數：{segment_count} | 更新時間：{last_update_time}"
-                )
-            else:
-                token_preview = token_value[:8] if token_value else "N/A"
-                display_value = (
-                    f"🎤 等待轉錄結果...\n\n開始時間：{last_update_time}\n"
-                    f"Token：{token_preview}\n\n約 3 秒後會出現第一段轉錄結果"
-                )
-                caption_text = (
-                    f"⏳ 等待中... | 已檢查次數："
-                    f"{fragment_state.get('segment_count', 0)} | "
-                    f"更新時間：{last_update_time}"
-                )
 
-            display_key = fragment_state.key("transcript_display_live")
-            st.session_state[display_key] = display_value
-            st.text_area(
-                f"即時逐字稿 (最後更新：{last_update_time})",
-                value=display_value,
-                height=300,
-                help="格式：yyyy-mm-dd hh:mi:ss + 逐字稿內容 | 自動檢測更新",
-                key=display_key,
-            )
-            st.caption(caption_text)
+def _render_transcript_display(state: _SessionState) -> None:
+    """Render the transcript area while not recording."""
+    st.markdown("#### 📄 即時轉錄結果")
 
-            snapshot_model, live_cost, _, _ = _calculate_cost_snapshot(
-                token_value,
-                fragment_state.get("model_name", model_value),
-            )
-            if snapshot_model != fragment_state.get("model_name", model_value):
-                fragment_state.set("model_name", snapshot_model)
+    state_prefix = state.prefix
 
-            if live_cost:
-                st.caption(_format_cost_caption(live_cost))
+    # Wait for the finalizer, then rerun so the final transcript is applied
+    if state.get("finalize_future") is not None:
 
-        _live_transcript_fragment(state_prefix, token, current_model)
+        @st.fragment(run_every=FINALIZE_POLL_INTERVAL_SECONDS)
+        def _finalize_wait_fragment(prefix: str) -> None:
+            future = _SessionState(prefix).get("finalize_future")
+            if future is None or future.done():
+                st.rerun()
+            st.info("⏳ 正在保存逐字稿，請稍候...")
+
+        _finalize_wait_fragment(state_prefix)
 
     # Show final transcript after recording stopped
     elif state.get("last_transcript"):
@@ -653,9 +875,9 @@ def render_transcription_feed(
         textarea_height: int,
         fallback: Optional[str],
     ) -> None:
-        with _recorder_lock:
-            token = _active_token
-            active_model = _active_model
+        active_state = _get_active_state()
+        token = active_state.token if active_state is not None else None
+        active_model = active_state.model_name if active_state is not None else None
 
         current_fallback = fallback or active_model or "whisper-1"
 
@@ -668,8 +890,11 @@ def render_transcription_feed(
             current_fallback,
         )
 
-        last_update_time = datetime.now().strftime("%H:%M:%S")
+        last_update_time = _clock_hms()
         token_preview = token[:8] if token else "N/A"
+        text_area_key = f"{fragment_prefix}_feed_text_area"
+        download_key = f"{fragment_prefix}_feed_download_data"
+        shown_key = f"{fragment_prefix}_feed_shown"
 
         if transcript_text:
             caption_text = (
@@ -677,20 +902,24 @@ def render_transcription_feed(
                 f"字元：{len(transcript_text)} | "
                 f"更新時間：{last_update_time} | Token：{token_preview}"
             )
-            display_value = transcript_text
+            # Rebuild the tail and download payload only when a segment lands
+            shown = (token, segment_count)
+            if st.session_state.get(shown_key) != shown:
+                st.session_state[text_area_key] = _transcript_tail(transcript_text)
+                st.session_state[download_key] = transcript_text.encode("utf-8")
+                st.session_state[shown_key] = shown
         else:
             caption_text = (
                 f"尚未取得轉錄內容，畫面將自動更新 | Token：{token_preview} | "
                 f"最後檢查：{last_update_time}"
             )
-            display_value = (
+            st.session_state[text_area_key] = (
                 "🎤 正在等待第一段轉錄結果...\n\n"
                 "麥克風錄音啟動後，逐字稿會自動出現在此處。"
             )
+            st.session_state[shown_key] = None
 
-        text_area_key = f"{fragment_prefix}_feed_text_area"
-        st.session_state[text_area_key] = display_value
-
+        display_value = st.session_state[text_area_key]
         st.text_area(
             "即時逐字稿",
             value=display_value,
@@ -705,7 +934,7 @@ def render_transcription_feed(
             download_name = f"transcript-live-{datetime.now().strftime('%Y%m%d-%H%M%S')}.txt"
             st.download_button(
                 "下載目前逐字稿 (.txt)",
-                data=transcript_text.encode("utf-8"),
+                data=st.session_state[download_key],
                 file_name=download_name,
                 mime="text/plain",
                 use_container_width=True,
@@ -717,14 +946,15 @@ def render_transcription_feed(
 
 def _start_recording(state: _SessionState, config: TranscriptionUIConfig) -> None:
     """Start recording and transcription."""
-    global _active_token, _active_model
+    global _active_slot
 
     # Prevent multiple simultaneous recordings
     with _recorder_lock:
-        if _active_token is not None:
+        active_state = _get_active_state()
+        if active_state is not None:
             print(
                 "[Transcription] Already recording with token "
-                f"{_active_token[:8]}, ignoring duplicate start request"
+                f"{active_state.token[:8]}, ignoring duplicate start request"
             )
             return
 
@@ -742,34 +972,35 @@ def _start_recording(state: _SessionState, config: TranscriptionUIConfig) -> Non
     print(f"[Transcription] WAV path: {wav_path}")
 
     # Initialize state for this token
-    start_time = time.time()
-    with _recorder_lock:
-        _active_token = token
-        _active_model = config.model_name
-        _audio_queues[token] = queue.Queue(maxsize=128)
-        _transcription_buffers[token] = []
-        _transcript_segments[token] = []
-        _wav_paths[token] = wav_path
-        _bytes_written[token] = 0
-        _last_rms[token] = 0.0
-        _last_transcription_time[token] = start_time
-        _worker_stop_events[token] = threading.Event()
-        _transcription_stop_events[token] = threading.Event()
-        _token_models[token] = config.model_name
-
-    worker_thread = threading.Thread(target=_audio_worker, args=(token,), daemon=True)
-    worker_thread.start()
-    with _recorder_lock:
-        _worker_threads[token] = worker_thread
-
-    transcription_thread = threading.Thread(
+    token_state = _TokenState(
+        token=token,
+        model_name=config.model_name,
+        wav_path=wav_path,
+    )
+    token_state.worker_thread = threading.Thread(
+        target=_audio_worker,
+        args=(token_state,),
+        daemon=True,
+    )
+    token_state.transcription_thread = threading.Thread(
         target=_transcription_worker,
-        args=(token,),
+        args=(token_state,),
         daemon=True,
     )
-    transcription_thread.start()
+
     with _recorder_lock:
-        _transcription_threads[token] = transcription_thread
+        free_slot = next(
+            (slot for slot, slot_state in enumerate(_sessions) if slot_state is None),
+            -1,
+        )
+        if free_slot < 0:
+            print("[Transcription] No free recording slot, previous session still stopping")
+            return
+        _sessions[free_slot] = token_state
+        _active_slot = free_slot
+
+    token_state.worker_thread.start()
+    token_state.transcription_thread.start()
 
     state.set("active", True)
     state.set("token", token)
@@ -788,8 +1019,8 @@ def _start_recording(state: _SessionState, config: TranscriptionUIConfig) -> Non
 
 
 def _stop_recording(state: _SessionState, config: TranscriptionUIConfig) -> None:
-    """Stop recording and save transcript."""
-    global _active_token, _active_model
+    """Stop recording; joining workers and saving run on the finalizer thread."""
+    global _active_slot
 
     token = state.get("token")
     if not token:
@@ -799,147 +1030,160 @@ def _stop_recording(state: _SessionState, config: TranscriptionUIConfig) -> None
 
     # Stop accepting new audio
     with _recorder_lock:
-        _active_token = None
-        _active_model = None
-
-    with _recorder_lock:
-        worker_stop = _worker_stop_events.get(token)
-        transcription_stop = _transcription_stop_events.get(token)
-        audio_queue = _audio_queues.get(token)
-
-    if worker_stop:
-        worker_stop.set()
-        if audio_queue:
-            try:
-                audio_queue.put(None, timeout=1.0)
-            except queue.Full:
-                pass
+        _active_slot = -1
+        token_state = _find_state(token)
 
-    if transcription_stop:
-        transcription_stop.set()
+    if token_state is not None:
+        token_state.worker_stop.set()
+        token_state.transcription_stop.set()
+        with token_state.chunk_ready:
+            token_state.chunk_ready.notify()
 
-    with _recorder_lock:
-        worker_thread = _worker_threads.get(token)
-        transcription_thread = _transcription_threads.get(token)
+    state.set("active", False)
+    state.set("token", None)
+    state.set("status", "⏳ 停止錄音，正在保存逐字稿...")
+    state.set(
+        "finalize_future",
+        _finalizer.submit(
+            _finalize_recording,
+            token_state,
+            state.get("model_name", "whisper-1"),
+        ),
+    )
 
-    if worker_thread and worker_thread.is_alive():
-        worker_thread.join(timeout=3.0)
+    st.rerun()
 
-    if transcription_thread and transcription_thread.is_alive():
-        transcription_thread.join(timeout=3.0)
 
-    with _recorder_lock:
-        wav_path = _wav_paths.get(token)
-        segments = _transcript_segments.get(token, [])
-        bytes_written = _bytes_written.get(token, 0)
-        model_used = _token_models.get(token, state.get("model_name", "whisper-1"))
-
-    formatted_lines = []
-    for seg in segments:
-        if isinstance(seg, dict):
-            formatted_lines.append(f"{seg['time']}  {seg['text']}")
-        else:
-            formatted_lines.append(str(seg))
+def _finalize_recording(
+    token_state: Optional[_TokenState],
+    fallback_model: str,
+) -> _RecordingResult:
+    """Wait for the workers of a stopped recording and save its transcript."""
+    wav_path: Optional[Path] = None
+    final_transcript = ""
+    bytes_written = 0
+    model_used = fallback_model
+
+    if token_state is not None:
+        worker_thread = token_state.worker_thread
+        transcription_thread = token_state.transcription_thread
+
+        if worker_thread and worker_thread.is_alive():
+            worker_thread.join(timeout=3.0)
+
+        # The worker drains its in-flight requests before exiting; this runs
+        # on the finalizer, so waiting out slow requests never blocks the UI
+        if transcription_thread and transcription_thread.is_alive():
+            transcription_thread.join(timeout=TRANSCRIPTION_FINALIZE_TIMEOUT)
+            if transcription_thread.is_alive():
+                print(
+                    f"[Transcription] Worker still running after "
+                    f"{TRANSCRIPTION_FINALIZE_TIMEOUT:.0f}s; saving transcript without "
+                    f"its pending segments"
+                )
 
-    final_transcript = "\n".join(formatted_lines)
+        wav_path = token_state.wav_path
+        final_transcript = token_state.transcript.text
+        bytes_written = token_state.bytes_written
+        model_used = token_state.model_name
 
-    state.set("active", False)
-    state.set("token", None)
-    state.set("last_model_name", model_used)
-    state.set("last_bytes_written", bytes_written)
+    result = _RecordingResult(
+        status="❌ 錄音檔案不存在",
+        model_name=model_used,
+        bytes_written=bytes_written,
+    )
 
     if wav_path and wav_path.exists():
         file_size = wav_path.stat().st_size
         if file_size > 44 and final_transcript:
-            transcript_path = _save_transcript(wav_path, final_transcript)
-
-            state.set("last_transcript", final_transcript)
-            state.set("last_path", str(transcript_path))
-            state.set("status", "✅ 轉錄完成")
+            result.transcript_path = _save_transcript(wav_path, final_transcript)
+            result.transcript = final_transcript
+            result.status = "✅ 轉錄完成"
 
-            print(f"[Transcription] Saved transcript: {transcript_path}")
+            print(f"[Transcription] Saved transcript: {result.transcript_path}")
         else:
-            state.set("status", "⚠️ 錄音時間太短或未檢測到語音")
-    else:
-        state.set("status", "❌ 錄音檔案不存在")
+            result.status = "⚠️ 錄音時間太短或未檢測到語音"
 
     audio_minutes = _audio_minutes_from_bytes(bytes_written)
-    cost_info = _estimate_transcription_cost(
+    result.cost_info = _estimate_transcription_cost(
         model_used,
         audio_minutes=audio_minutes,
         transcript_text=final_transcript,
     )
-    state.set("last_cost", cost_info)
-
-    with _recorder_lock:
-        _audio_queues.pop(token, None)
-        _transcription_buffers.pop(token, None)
-        _transcript_segments.pop(token, None)
-        _wav_paths.pop(token, None)
-        _wav_writers.pop(token, None)
-        _bytes_written.pop(token, None)
-        _last_rms.pop(token, None)
-        _worker_threads.pop(token, None)
-        _worker_stop_events.pop(token, None)
-        _transcription_threads.pop(token, None)
-        _transcription_stop_events.pop(token, None)
-        _last_transcription_time.pop(token, None)
-        _token_models.pop(token, None)
 
-    st.rerun()
+    if token_state is not None:
+        with _recorder_lock:
+            _release_state(token_state)
 
+    return result
 
-def _audio_worker(token: str) -> None:
-    """Worker thread to write audio data to WAV file."""
-    print(f"[Transcription] Audio worker started for token {token[:8]}")
 
-    with _recorder_lock:
-        audio_queue = _audio_queues.get(token)
-        wav_path = _wav_paths.get(token)
-        stop_event = _worker_stop_events.get(token)
+def _apply_finished_recording(state: _SessionState) -> None:
+    """Copy a completed finalizer result into session state."""
+    future = state.get("finalize_future")
+    if future is None or not future.done():
+        return
 
-    if not audio_queue or not wav_path or not stop_event:
-        print("[Transcription] Audio worker missing resources")
+    state.set("finalize_future", None)
+    try:
+        result: _RecordingResult = future.result()
+    except Exception as exc:
+        print(f"[Transcription] Error finalizing recording: {exc}")
+        state.set("status", "❌ 保存逐字稿失敗")
         return
 
-    wav_writer = None
+    state.set("last_model_name", result.model_name)
+    state.set("last_bytes_written", result.bytes_written)
+    state.set("last_cost", result.cost_info)
+    state.set("status", result.status)
+    if result.transcript_path is not None:
+        state.set("last_transcript", result.transcript)
+        state.set("last_path", str(result.transcript_path))
+
+
+def _audio_worker(token_state: _TokenState) -> None:
+    """Worker thread to write audio data to WAV file."""
+    print(f"[Transcription] Audio worker started for token {token_state.token[:8]}")
+
+    ring = token_state.ring
+    wav_path = token_state.wav_path
+    stop_event = token_state.worker_stop
+
+    wav_writer: Optional[MappedWavWriter] = None
+    read_index = 0
     chunks_processed = 0
 
     try:
-        while not stop_event.is_set():
-            try:
-                item = audio_queue.get(timeout=1.0)
-            except queue.Empty:
-                continue
-
-            if item is None:  # Stop signal
+        while True:
+            # Drain after the stop signal too, so trailing audio is kept
+            stopping = stop_event.wait(AUDIO_WORKER_POLL_SECONDS)
+
+            pcm_chunk, read_index, dropped = ring.read(read_index)
+            if dropped:
+                print(f"[Transcription] WAV writer overrun, dropped {dropped} samples")
+
+            if pcm_chunk.size:
+                if wav_writer is None:
+                    print(f"[Transcription] Opening WAV file: {wav_path}")
+                    wav_writer = MappedWavWriter(wav_path, SAMPLE_RATE)
+
+                wav_writer.write(pcm_chunk)
+                chunks_processed += 1
+                token_state.bytes_written += pcm_chunk.nbytes
+
+                if chunks_processed == 1:
+                    print(
+                        "[Transcription] First chunk written, "
+                        f"RMS={calculate_rms(pcm_chunk):.1f}"
+                    )
+
+            if stopping:
                 print(
                     "[Transcription] Stop signal received, "
                     f"processed {chunks_processed} chunks"
                 )
                 break
 
-            pcm_bytes, rms = item
-
-            if wav_writer is None:
-                print(f"[Transcription] Opening WAV file: {wav_path}")
-                wav_writer = wave.open(str(wav_path), "wb")
-                wav_writer.setnchannels(1)
-                wav_writer.setsampwidth(SAMPLE_WIDTH)
-                wav_writer.setframerate(SAMPLE_RATE)
-                with _recorder_lock:
-                    _wav_writers[token] = wav_writer
-
-            wav_writer.writeframes(pcm_bytes)
-            chunks_processed += 1
-
-            with _recorder_lock:
-                _bytes_written[token] = _bytes_written.get(token, 0) + len(pcm_bytes)
-                _last_rms[token] = rms
-
-            if chunks_processed == 1:
-                print(f"[Transcription] First chunk written, RMS={rms:.1f}")
-
     finally:
         if wav_writer:
             try:
@@ -951,105 +1195,243 @@ def _audio_worker(token: str) -> None:
     print(f"[Transcription] Audio worker stopped")
 
 
-def _transcription_worker(token: str) -> None:
-    """Worker thread for background transcription."""
+def _transcription_worker(token_state: _TokenState) -> None:
+    """
+    Worker thread for background transcription.
+
+    On stop it sends no new audio but waits for requests already in flight,
+    so their segments land in the transcript before the thread exits;
+    _finalize_recording joins it for up to TRANSCRIPTION_FINALIZE_TIMEOUT.
+    """
+    token = token_state.token
     print(f"[Transcription] Transcription worker started for token {token[:8]}")
 
-    from openai import OpenAI
+    client = _get_openai_client()
 
-    client = OpenAI()
+    stop_event = token_state.transcription_stop
+    chunk_ready = token_state.chunk_ready
+    ring = token_state.ring
+    # Reused every tick; grown only if a tick ever sees more audio
+    staging = np.empty(TRANSCRIPTION_STAGING_SAMPLES, dtype=np.int16)
+    # (time_str, rms, future) in capture order, so segments stay ordered
+    in_flight: deque = deque()
 
-    with _recorder_lock:
-        stop_event = _transcription_stop_events.get(token)
+    def _wake_worker(_future: Future) -> None:
+        with chunk_ready:
+            chunk_ready.notify()
 
-    if not stop_event:
-        print("[Transcription] Transcription worker missing stop event")
-        return
+    with ThreadPoolExecutor(
+        max_workers=TRANSCRIPTION_MAX_IN_FLIGHT,
+        thread_name_prefix="transcription-api",
+    ) as executor:
+        while not stop_event.is_set():
+            # Sleep until the callback reports a full chunk or an API call
+            # finishes; the timeout still flushes partial audio if frames
+            # stop arriving
+            timed_out = False
+            with chunk_ready:
+                if (
+                    not stop_event.is_set()
+                    and (
+                        len(in_flight) >= TRANSCRIPTION_MAX_IN_FLIGHT
+                        or ring.pending(token_state.transcription_read_index)
+                        < TRANSCRIPTION_CHUNK_SAMPLES
+                    )
+                    and not (in_flight and in_flight[0][2].done())
+                ):
+                    timed_out = not chunk_ready.wait(
+                        timeout=TRANSCRIPTION_FLUSH_TIMEOUT
+                    )
+
+            _collect_transcripts(token_state, in_flight)
+            token_state.requests_in_flight = len(in_flight)
+            if stop_event.is_set():
+                break
 
-    while not stop_event.is_set():
-        time.sleep(0.5)
+            # While every request slot is busy, audio stays in the ring and
+            # goes out as one longer request once a slot frees: a slow API
+            # gets fewer, larger calls instead of an ever-growing queue
+            if len(in_flight) >= TRANSCRIPTION_MAX_IN_FLIGHT:
+                continue
 
-        with _recorder_lock:
-            last_time = _last_transcription_time.get(token, 0)
+            pending = ring.pending(token_state.transcription_read_index)
+            if pending < TRANSCRIPTION_CHUNK_SAMPLES and not timed_out:
+                continue
+            if pending > len(staging):
+                staging = np.empty(pending * 2, dtype=np.int16)
 
-        current_time = time.time()
-        elapsed = current_time - last_time
+            audio_chunk, read_index, dropped = ring.read(
+                token_state.transcription_read_index,
+                out=staging,
+            )
+            token_state.transcription_read_index = read_index
+            if dropped:
+                print(f"[Transcription] Transcription backlog overrun, dropped {dropped} samples")
 
-        if elapsed >= TRANSCRIPTION_CHUNK_DURATION:
-            with _recorder_lock:
-                buffer = _transcription_buffers.get(token)
-                if not buffer:
-                    _last_transcription_time[token] = current_time
-                    continue
+            if audio_chunk.size == 0:
+                continue
 
-                audio_chunk = np.concatenate(buffer)
-                buffer.clear()
-                _last_transcription_time[token] = current_time
+            # End the chunk at the quietest moment of its last half second so a
+            # word straddling the boundary goes out whole with the next chunk;
+            # the remainder stays in the ring. A timeout flushes everything.
+            if not timed_out:
+                split = find_quiet_split(
+                    audio_chunk,
+                    SAMPLE_RATE,
+                    search_secs=CHUNK_BOUNDARY_SEARCH_SECONDS,
+                    rms_threshold=VAD_RMS_THRESHOLD,
+                )
+                token_state.transcription_read_index -= audio_chunk.size - split
+                audio_chunk = audio_chunk[:split]
 
             chunk_rms = float(calculate_rms(audio_chunk))
-            if not is_voiced_chunk(
-                audio_chunk,
-                int(VAD_RMS_THRESHOLD),
-                min_density=VAD_SAMPLE_DENSITY,
-                amplitude_gate=VAD_AMPLITUDE_GATE,
-            ):
-                print(
-                    "[Transcription] Skipping non-voiced chunk "
-                    f"(RMS={chunk_rms:.1f}, density<{VAD_SAMPLE_DENSITY})"
+            voiced_pcm = _voiced_samples(audio_chunk, chunk_rms)
+            if voiced_pcm is None:
+                logger.debug(
+                    "Skipping non-voiced chunk (RMS=%.1f, density<%s)",
+                    chunk_rms,
+                    VAD_SAMPLE_DENSITY,
                 )
                 continue
 
-            try:
-                with _recorder_lock:
-                    model_name = _token_models.get(token, "whisper-1")
-
-                wav_bytes = _pcm_to_wav_bytes(audio_chunk, SAMPLE_RATE)
-                wav_file = io.BytesIO(wav_bytes)
-                wav_file.name = "chunk.wav"
-
-                transcript = client.audio.transcriptions.create(
-                    model=model_name,
-                    file=wav_file,
-                    language="zh",
-                    response_format="text",
-                )
-
-                if transcript and transcript.strip():
-                    transcript_text = transcript.strip()
-                    transcript_text = _convert_to_traditional_chinese(transcript_text)
-
-                    time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-                    segment_data = {"time": time_str, "text": transcript_text}
-
-                    with _recorder_lock:
-                        segments = _transcript_segments.get(token)
-                        if segments is not None:
-                            segments.append(segment_data)
-                            segment_count = len(segments)
-                            print(
-                                f"[Transcription] Segment {segment_count} "
-                                f"[{time_str}] (model={model_name}, RMS={chunk_rms:.1f}): "
-                                f"{transcript_text[:50]}..."
-                            )
-                            print(
-                                "[Transcription] Total segments in buffer: "
-                                f"{segment_count}"
-                            )
-                        else:
-                            print(
-                                "[Transcription] ERROR: segments list is None "
-                                f"for token {token[:8]}"
-                            )
-                else:
-                    print(f"[Transcription] Empty transcript (RMS={chunk_rms:.1f})")
+            # Archive WAV stays at 48 kHz; the API only needs 16 kHz. The
+            # resampled copy also frees the staging buffer for the next tick
+            upload_pcm = resample_pcm(voiced_pcm, SAMPLE_RATE, WHISPER_SAMPLE_RATE)
+            time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            # Chunks are cut independently; the latest confirmed text carries
+            # names, terms and script across the boundary
+            future = executor.submit(
+                _transcribe_chunk,
+                client,
+                token_state.model_name,
+                upload_pcm,
+                token_state.transcript.recent_text,
+            )
+            future.add_done_callback(_wake_worker)
+            in_flight.append((time_str, chunk_rms, future))
+            token_state.requests_in_flight = len(in_flight)
 
-            except Exception as exc:
-                print(f"[Transcription] Error transcribing: {exc}")
+        # Let requests already sent finish so their text is not lost; each
+        # is bounded by the client's timeout and retry budget
+        _collect_transcripts(token_state, in_flight, block=True)
 
     print("[Transcription] Transcription worker stopped")
 
 
+def _is_voiced(pcm: np.ndarray, rms: Optional[float] = None) -> bool:
+    """Apply the widget's VAD thresholds to pcm."""
+    return is_voiced_chunk(
+        pcm,
+        int(VAD_RMS_THRESHOLD),
+        min_density=VAD_SAMPLE_DENSITY,
+        amplitude_gate=VAD_AMPLITUDE_GATE,
+        rms=rms,
+    )
+
+
+def _voiced_samples(audio: np.ndarray, rms: float) -> Optional[np.ndarray]:
+    """
+    Return the speech in audio, or None if it is all silence.
+
+    A read taken after a backlog spans several chunks; each chunk-sized piece
+    is judged on its own so a short utterance is not diluted by the silence
+    around it.
+    """
+    pieces = audio.size // TRANSCRIPTION_CHUNK_SAMPLES
+    if pieces < 2:
+        return audio if _is_voiced(audio, rms) else None
+
+    voiced = [piece for piece in np.array_split(audio, pieces) if _is_voiced(piece)]
+    if not voiced:
+        return None
+    if len(voiced) == pieces:
+        return audio
+    return np.concatenate(voiced)
+
+
+def _transcribe_chunk(
+    client: Any, model_name: str, upload_pcm: np.ndarray, prompt: str = ""
+) -> str:
+    """Send one 16 kHz chunk to the transcription API and return its text."""
+    try:
+        upload_file = _upload_buffers.get_nowait()
+    except queue.Empty:
+        upload_file = io.BytesIO()
+
+    try:
+        upload_file.seek(0)
+        upload_file.truncate(0)
+        upload_file.name = _encode_upload_chunk(
+            upload_pcm, WHISPER_SAMPLE_RATE, upload_file
+        )
+        upload_file.seek(0)
+
+        request_options: dict[str, Any] = {}
+        if prompt:
+            request_options["prompt"] = prompt
+        transcript = client.audio.transcriptions.create(
+            model=model_name,
+            file=upload_file,
+            language="zh",
+            response_format="text",
+            **request_options,
+        )
+    except Exception as exc:
+        print(f"[Transcription] Error transcribing: {exc}")
+        return ""
+    finally:
+        try:
+            _upload_buffers.put_nowait(upload_file)
+        except queue.Full:
+            pass
+
+    if not transcript or not transcript.strip():
+        return ""
+    return _convert_to_traditional_chinese(transcript.strip())
+
+
+def _collect_transcripts(
+    token_state: _TokenState, in_flight: deque, block: bool = False
+) -> None:
+    """Append finished transcriptions to the session in capture order."""
+    while in_flight and (block or in_flight[0][2].done()):
+        time_str, chunk_rms, future = in_flight.popleft()
+        transcript_text = future.result()
+
+        if not transcript_text:
+            logger.debug("Empty transcript (RMS=%.1f)", chunk_rms)
+            continue
+
+        line = _format_segment(time_str, transcript_text)
+
+        # Only this worker writes the snapshot, so no lock is needed to
+        # build and publish the next one
+        previous = token_state.transcript
+        text = f"{previous.text}\n{line}" if previous.text else line
+        segment_count = previous.segment_count + 1
+        recent_text = (
+            f"{previous.recent_text} {transcript_text}"
+            if previous.recent_text
+            else transcript_text
+        )[-TRANSCRIPTION_PROMPT_CHARS:]
+        token_state.transcript = _TranscriptSnapshot(text, segment_count, recent_text)
+        logger.debug(
+            "Segment %d [%s] (model=%s, RMS=%.1f): %.50s",
+            segment_count,
+            time_str,
+            token_state.model_name,
+            chunk_rms,
+            transcript_text,
+        )
+
+
+@lru_cache(maxsize=4096)
+def _cached_s2t(text: str) -> str:
+    """Convert a short, likely recurring phrase once and reuse the result."""
+    return _opencc_converter.convert(text)
+
+
 def _convert_to_traditional_chinese(text: str) -> str:
     """
     Convert Simplified Chinese to Traditional Chinese.
@@ -1060,27 +1442,44 @@ def _convert_to_traditional_chinese(text: str) -> str:
     Returns:
         Text with all Simplified Chinese converted to Traditional Chinese
     """
+    # Pure ASCII (English, digits, punctuation) has nothing to convert
+    if text.isascii():
+        return text
+
     try:
-        converted = _opencc_converter.convert(text)
+        if len(text) <= S2T_CACHE_MAX_CHARS:
+            converted = _cached_s2t(text)
+        else:
+            converted = _opencc_converter.convert(text)
         if converted != text:
-            print(f"[S2T] Converted: '{text}' -> '{converted}'")
+            logger.debug("S2T converted: %r -> %r", text, converted)
         return converted
     except Exception as exc:
         print(f"[S2T] Error converting text: {exc}")
         return text
 
 
-def _pcm_to_wav_bytes(pcm_data: np.ndarray, sample_rate: int) -> bytes:
-    """Convert PCM numpy array to WAV bytes."""
-    wav_buffer = io.BytesIO()
+def _encode_upload_chunk(
+    pcm_data: np.ndarray, sample_rate: int, output: io.BytesIO
+) -> str:
+    """Encode a chunk for the transcription API into output, returning its filename."""
+    global _flac_upload_enabled
 
-    with wave.open(wav_buffer, "wb") as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(pcm_data.tobytes())
+    if _flac_upload_enabled:
+        try:
+            write_flac_chunk(output, pcm_data, sample_rate)
+            return "chunk.flac"
+        except Exception as exc:
+            print(f"[Transcription] FLAC encoding unavailable, using WAV: {exc}")
+            _flac_upload_enabled = False
+            output.seek(0)
+            output.truncate(0)
 
-    return wav_buffer.getvalue()
+    # Fixed mono int16 layout: one packed header, samples written straight
+    # from the array buffer
+    output.write(build_wav_header(pcm_data.nbytes, sample_rate))
+    output.write(np.ascontiguousarray(pcm_data, dtype=np.int16))
+    return "chunk.wav"
 
 
 def _save_transcript(wav_path: Path, transcript: str) -> Path:
@@ -1089,20 +1488,13 @@ def _save_transcript(wav_path: Path, transcript: str) -> Path:
     transcript_path = wav_path.parent / transcript_filename
 
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    header = f"""語音轉錄結果
-時間：{timestamp}
-音訊檔案：{wav_path.name}
-採樣率：{SAMPLE_RATE} Hz
-模型：OpenAI 
-格式：yyyy-mm-dd hh:mi:ss + 逐字稿內容
-
-{'=' * 60}
-
-"""
+    header = _TRANSCRIPT_HEADER_TEMPLATE.format(
+        timestamp=timestamp,
+        filename=wav_path.name,
+    )
 
-    with open(transcript_path, "w", encoding="utf-8") as f:
-        f.write(header)
-        f.write(transcript)
+    # One payload in a single write; text mode keeps the platform's newlines
+    transcript_path.write_text(header + transcript, encoding="utf-8")
 
     return transcript_path
 
@@ -6,9 +6,36 @@ This module provides audio processing utilities for:
 - WAV file format conversion for OpenAI API submission
 """
 
+import math
 import struct
 import numpy as np
 
+WAV_HEADER_SIZE = 44  # bytes, canonical PCM RIFF/WAVE header
+
+# Format parsed once at import instead of on every header build
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def sum_of_squares(pcm_data: np.ndarray) -> int:
+    """
+    Sum of squared int16 PCM samples, for accumulating RMS over many frames.
+
+    Args:
+        pcm_data: 1D NumPy array of int16 PCM audio samples
+
+    Returns:
+        float64 sum of squares as a Python int, exact below 2**53
+
+    Example:
+        >>> total = sum_of_squares(frame_a) + sum_of_squares(frame_b)
+        >>> rms = math.sqrt(total / (len(frame_a) + len(frame_b)))
+    """
+    # Single BLAS dot product, without materializing a squared temporary.
+    # float64 is exact up to 2**53 (~8.6 million full-scale samples) while
+    # int32 would overflow on a few seconds of loud int16 audio.
+    float_data = pcm_data.astype(np.float64, copy=False)
+    return int(np.dot(float_data, float_data))
+
 
 def calculate_rms(pcm_data: np.ndarray) -> float:
     """
@@ -24,10 +51,10 @@ def calculate_rms(pcm_data: np.ndarray) -> float:
         >>> pcm = np.array([100, -200, 300, -400], dtype=np.int16)
         >>> rms = calculate_rms(pcm)
         >>> print(f"RMS: {rms:.2f}")
-        RMS: 264.58
+        RMS: 273.86
 
     Notes:
-        - RMS is calculated as sqrt(mean(square(samples)))
+        - RMS is calculated as sqrt(sum_of_squares(samples) / n)
         - Higher RMS indicates louder audio
         - Typical speech RMS: 200-800 for 48kHz int16 samples
         - Background noise RMS: 50-150
@@ -35,14 +62,35 @@ def calculate_rms(pcm_data: np.ndarray) -> float:
     if len(pcm_data) == 0:
         return 0.0
 
-    # Convert to float to avoid overflow in squaring operation
-    float_data = pcm_data.astype(np.float64)
+    return math.sqrt(sum_of_squares(pcm_data) / len(pcm_data))
+
 
-    # Calculate mean of squares, then square root
-    mean_square = np.mean(float_data ** 2)
-    rms = np.sqrt(mean_square)
+def build_wav_header(data_size: int, sample_rate: int = 48000) -> bytes:
+    """
+    Build the 44-byte RIFF/WAVE header for mono 16-bit PCM data.
+
+    Args:
+        data_size: Size of the PCM payload in bytes
+        sample_rate: Sample rate in Hz (default: 48000 for WebRTC)
+
+    Returns:
+        Header bytes (always WAV_HEADER_SIZE long)
+
+    Example:
+        >>> header = build_wav_header(6, 48000)
+        >>> len(header)
+        44
+    """
+    num_channels = 1
+    bits_per_sample = 16
+    block_align = num_channels * bits_per_sample // 8
+    byte_rate = sample_rate * block_align
 
-    return float(rms)
+    return _WAV_HEADER.pack(
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, num_channels, sample_rate, byte_rate, block_align, bits_per_sample,
+        b"data", data_size,
+    )
 
 
 def pcm16_to_wav_bytes(pcm_data: np.ndarray, sample_rate: int = 48000) -> bytes:
@@ -81,37 +129,8 @@ def pcm16_to_wav_bytes(pcm_data: np.ndarray, sample_rate: int = 48000) -> bytes:
     if sample_rate <= 0:
         raise ValueError(f"sample_rate must be positive, got {sample_rate}")
 
-    # Audio format parameters
-    num_channels = 1  # Mono
-    bits_per_sample = 16
-    byte_rate = sample_rate * num_channels * bits_per_sample // 8
-    block_align = num_channels * bits_per_sample // 8
-    data_size = len(pcm_data) * 2  # 2 bytes per int16 sample
-
-    # Build WAV header (44 bytes total)
-    header = bytearray()
-
-    # RIFF chunk descriptor (12 bytes)
-    header.extend(b'RIFF')  # ChunkID
-    header.extend(struct.pack('<I', 36 + data_size))  # ChunkSize (4 + 24 + 8 + data_size)
-    header.extend(b'WAVE')  # Format
-
-    # fmt sub-chunk (24 bytes)
-    header.extend(b'fmt ')  # Subchunk1ID
-    header.extend(struct.pack('<I', 16))  # Subchunk1Size (16 for PCM)
-    header.extend(struct.pack('<H', 1))  # AudioFormat (1 = PCM)
-    header.extend(struct.pack('<H', num_channels))  # NumChannels
-    header.extend(struct.pack('<I', sample_rate))  # SampleRate
-    header.extend(struct.pack('<I', byte_rate))  # ByteRate
-    header.extend(struct.pack('<H', block_align))  # BlockAlign
-    header.extend(struct.pack('<H', bits_per_sample))  # BitsPerSample
-
-    # data sub-chunk (8 bytes header + data)
-    header.extend(b'data')  # Subchunk2ID
-    header.extend(struct.pack('<I', data_size))  # Subchunk2Size
-
-    # Combine header and PCM data
-    pcm_bytes = pcm_data.tobytes()
-    wav_bytes = bytes(header) + pcm_bytes
-
-    return wav_bytes
+    header = build_wav_header(len(pcm_data) * 2, sample_rate)  # 2 bytes per int16 sample
+
+    # Join straight from the array's buffer: the samples are copied once,
+    # without a tobytes() temporary or a bytearray-to-bytes conversion
+    return b"".join((header, np.ascontiguousarray(pcm_data)))
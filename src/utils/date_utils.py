@@ -1,8 +1,13 @@
 """Date and time utility functions."""
 from datetime import datetime
-from typing import Tuple
+from functools import lru_cache
+from typing import Optional, Tuple
 
+# Sessions share a handful of dates and time slots, so parses repeat constantly
+PARSE_CACHE_SIZE = 512
 
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def parse_date(date_str: str) -> datetime:
     """
     Parse date string in YYYY-MM-DD format.
@@ -19,6 +24,7 @@ def parse_date(date_str: str) -> datetime:
     return datetime.strptime(date_str, "%Y-%m-%d")
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def parse_time(time_str: str) -> Tuple[datetime, datetime]:
     """
     Parse time range string in HH:MM-HH:MM format.
@@ -66,12 +72,19 @@ def is_past_datetime(date_str: str, time_str: str) -> bool:
     Returns:
         True if start datetime is before now, False otherwise
     """
+    # Only the parse is cached; "now" is read on every call so it never goes stale
+    session_datetime = _session_start(date_str, time_str)
+    return session_datetime is not None and session_datetime < datetime.now()
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _session_start(date_str: str, time_str: str) -> Optional[datetime]:
+    """Return the session start datetime, or None if the strings cannot be parsed."""
     try:
         start_time_str = time_str.split("-")[0].strip()
-        session_datetime = datetime.strptime(
+        return datetime.strptime(
             f"{date_str} {start_time_str}",
             "%Y-%m-%d %H:%M"
         )
-        return session_datetime < datetime.now()
     except (ValueError, IndexError):
-        return False
+        return None
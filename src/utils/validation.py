@@ -1,7 +1,47 @@
 """Data validation utilities."""
 import re
-from datetime import datetime
-from typing import Any, Dict, List, Tuple
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+_SESSION_ID_RE = re.compile(r"^session_\d{3}$")
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TIME_RANGE_RE = re.compile(r"^\d{2}:\d{2}-\d{2}:\d{2}$")
+
+
+def _parse_iso_date(date_str: str) -> date:
+    """
+    Parse a YYYY-MM-DD string that matched _DATE_RE.
+
+    fromisoformat handles the common valid case; anything it rejects goes
+    through strptime so callers keep the same acceptance and error text.
+    """
+    try:
+        return date.fromisoformat(date_str)
+    except ValueError:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
+def _minutes_of_day(hhmm: str) -> Optional[int]:
+    """Convert an ASCII HH:MM string to minutes, None if out of range."""
+    hour, minute = int(hhmm[0:2]), int(hhmm[3:5])
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def _validate_time_range_strptime(time_str: str) -> None:
+    """Check a time range with strptime, raising the messages callers have always seen."""
+    try:
+        start_str, end_str = (part.strip() for part in time_str.split("-"))
+        start_time = datetime.strptime(start_str, "%H:%M")
+        end_time = datetime.strptime(end_str, "%H:%M")
+    except ValueError as e:
+        if "does not match format" in str(e):
+            raise ValueError(f"Invalid time value: {time_str}")
+        raise
+
+    if start_time >= end_time:
+        raise ValueError(f"Start time must be before end time: {time_str}")
 
 
 def validate_session(session_data: Dict[str, Any]) -> bool:
@@ -30,7 +70,7 @@ def validate_session(session_data: Dict[str, Any]) -> bool:
         if field not in session_data:
             raise ValueError(f"Missing required field: {field}")
 
-    if not re.match(r"^session_\d{3}$", session_data["id"]):
+    if not _SESSION_ID_RE.match(session_data["id"]):
         raise ValueError(f"Invalid session ID format: {session_data['id']}")
 
     if not session_data["title"] or not session_data["title"].strip():
@@ -139,11 +179,11 @@ def validate_date_format(date_str: str) -> bool:
     if date_str.strip().upper() == "TBD":
         return True
 
-    if not re.match(r"^\d{4}-\d{2}-\d{2}$", date_str):
+    if not _DATE_RE.match(date_str):
         raise ValueError(f"Date must be in YYYY-MM-DD format or TBD: {date_str}")
 
     try:
-        datetime.strptime(date_str, "%Y-%m-%d")
+        _parse_iso_date(date_str)
     except ValueError as e:
         raise ValueError(f"Invalid date value: {date_str} - {str(e)}")
 
@@ -166,27 +206,24 @@ def validate_time_format(time_str: str) -> bool:
     if not isinstance(time_str, str):
         raise ValueError("Time must be a string")
 
-    if not re.match(r"^\d{2}:\d{2}-\d{2}:\d{2}$", time_str):
+    if not _TIME_RANGE_RE.match(time_str):
         raise ValueError(f"Time must be in HH:MM-HH:MM format: {time_str}")
 
-    try:
-        parts = time_str.split("-")
-        if len(parts) != 2:
-            raise ValueError(f"Time range must have start and end times: {time_str}")
-
-        start_str = parts[0].strip()
-        end_str = parts[1].strip()
-
-        start_time = datetime.strptime(start_str, "%H:%M")
-        end_time = datetime.strptime(end_str, "%H:%M")
+    # Rare inputs (non-ASCII digits, out-of-range fields) keep strptime's
+    # behaviour and messages; the common case skips it entirely
+    if not time_str.isascii():
+        _validate_time_range_strptime(time_str)
+        return True
 
-        if start_time >= end_time:
-            raise ValueError(f"Start time must be before end time: {time_str}")
+    # The regex already fixed the layout, so the fields sit at fixed offsets
+    start_minutes = _minutes_of_day(time_str[0:5])
+    end_minutes = _minutes_of_day(time_str[6:11])
+    if start_minutes is None or end_minutes is None:
+        _validate_time_range_strptime(time_str)
+        return True
 
-    except ValueError as e:
-        if "does not match format" in str(e):
-            raise ValueError(f"Invalid time value: {time_str}")
-        raise
+    if start_minutes >= end_minutes:
+        raise ValueError(f"Start time must be before end time: {time_str}")
 
     return True
 
@@ -248,19 +285,19 @@ def validate_session_date(date_str: str, allow_past: bool = False) -> Tuple[bool
     if not isinstance(date_str, str):
         return False, "日期格式錯誤"
 
-    if not re.match(r"^\d{4}-\d{2}-\d{2}$", date_str):
+    if not _DATE_RE.match(date_str):
         return False, "日期格式錯誤"
 
     # Parse date
     try:
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+        date_obj = _parse_iso_date(date_str)
     except ValueError:
         return False, "日期格式錯誤"
 
     # Check if past (if not allowed)
     if not allow_past:
         today = datetime.now().date()
-        if date_obj.date() < today:
+        if date_obj < today:
             return False, "日期不可為過去"
 
     return True, ""
@@ -327,11 +364,11 @@ def validate_registration_start_date(start_date_str: str, session_date_str: str)
     if not isinstance(start_date_str, str):
         return False, "日期格式錯誤"
 
-    if not re.match(r"^\d{4}-\d{2}-\d{2}$", start_date_str):
+    if not _DATE_RE.match(start_date_str):
         return False, "日期格式錯誤"
 
     try:
-        start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+        start_date = _parse_iso_date(start_date_str)
     except ValueError:
         return False, "日期格式錯誤"
 
@@ -0,0 +1,230 @@
+"""Unit tests for audio service."""
+import io
+import wave
+
+import av
+import numpy as np
+import pytest
+
+from src.services.audio_service import (
+    MappedWavWriter,
+    PcmRingBuffer,
+    create_flac_chunk,
+    find_quiet_split,
+    is_voiced_chunk,
+    process_audio_frame,
+    resample_pcm,
+)
+
+
+class TestMappedWavWriter:
+    """Test memory-mapped WAV persistence."""
+
+    def test_appends_are_readable_as_wav(self, tmp_path):
+        """Test written frames round-trip through the wave module."""
+        path = tmp_path / "out.wav"
+        pcm = np.arange(-3000, 3000, dtype=np.int16)
+
+        writer = MappedWavWriter(path, 16000, extent_secs=0.1)
+        for start in range(0, len(pcm), 960):
+            writer.write(pcm[start:start + 960])
+        writer.close()
+
+        with wave.open(str(path), "rb") as reader:
+            assert reader.getframerate() == 16000
+            assert reader.getnchannels() == 1
+            assert reader.getsampwidth() == 2
+            frames = reader.readframes(reader.getnframes())
+
+        assert np.array_equal(np.frombuffer(frames, dtype=np.int16), pcm)
+
+    def test_close_trims_preallocated_tail(self, tmp_path):
+        """Test closing truncates the file to header plus data."""
+        path = tmp_path / "short.wav"
+
+        writer = MappedWavWriter(path, 48000)
+        writer.write(b"\x01\x00\x02\x00")
+        writer.close()
+        writer.close()
+
+        assert path.stat().st_size == 44 + 4
+
+
+class TestPcmRingBuffer:
+    """Test the single-producer PCM ring buffer."""
+
+    def test_read_returns_samples_since_index(self):
+        """Test independent readers each see every written sample."""
+        ring = PcmRingBuffer(16)
+        ring.write(np.arange(5, dtype=np.int16))
+        ring.write(np.arange(5, 9, dtype=np.int16))
+
+        first, first_index, dropped = ring.read(0)
+        assert np.array_equal(first, np.arange(9))
+        assert first_index == 9
+        assert dropped == 0
+
+        tail, _, _ = ring.read(5)
+        assert np.array_equal(tail, np.arange(5, 9))
+
+    def test_read_across_wrap(self):
+        """Test reads spanning the end of the buffer are contiguous."""
+        ring = PcmRingBuffer(8)
+        ring.write(np.arange(6, dtype=np.int16))
+        _, index, _ = ring.read(0)
+        ring.write(np.arange(6, 11, dtype=np.int16))
+
+        samples, index, dropped = ring.read(index)
+        assert np.array_equal(samples, np.arange(6, 11))
+        assert index == 11
+        assert dropped == 0
+
+    def test_overrun_drops_oldest_samples(self):
+        """Test a lagging reader loses only overwritten samples."""
+        ring = PcmRingBuffer(4)
+        ring.write(np.arange(10, dtype=np.int16))
+
+        samples, index, dropped = ring.read(0)
+        assert np.array_equal(samples, np.arange(6, 10))
+        assert index == 10
+        assert dropped == 6
+
+    def test_read_into_staging_array(self):
+        """Test reads reuse a large enough caller-provided array."""
+        ring = PcmRingBuffer(8)
+        ring.write(np.arange(6, dtype=np.int16))
+        _, index, _ = ring.read(0)
+        ring.write(np.arange(6, 11, dtype=np.int16))
+        staging = np.zeros(16, dtype=np.int16)
+
+        samples, _, _ = ring.read(index, out=staging)
+        assert np.shares_memory(samples, staging)
+        assert np.array_equal(samples, np.arange(6, 11))
+
+
+class TestCreateFlacChunk:
+    """Test FLAC encoding for transcription uploads."""
+
+    def test_round_trip_is_lossless(self):
+        """Test decoded FLAC matches the original samples."""
+        pcm = np.arange(-4000, 4000, dtype=np.int16)
+
+        flac_bytes = create_flac_chunk(pcm, 16000)
+
+        with av.open(io.BytesIO(flac_bytes)) as container:
+            assert container.streams.audio[0].rate == 16000
+            decoded = np.concatenate(
+                [frame.to_ndarray().reshape(-1) for frame in container.decode(audio=0)]
+            )
+        assert np.array_equal(decoded, pcm)
+
+
+class TestResamplePcm:
+    """Test sample-rate conversion for transcription uploads."""
+
+    def test_downsamples_48k_to_16k(self):
+        """Test output length is a third and in-band tones survive."""
+        t = np.arange(48000) / 48000
+        pcm = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+
+        resampled = resample_pcm(pcm, 48000, 16000)
+
+        assert resampled.dtype == np.int16
+        assert len(resampled) == 16000
+        assert np.abs(resampled[100:-100]).max() > 7000
+
+    def test_removes_content_above_new_nyquist(self):
+        """Test a 10 kHz tone is filtered rather than aliased."""
+        t = np.arange(48000) / 48000
+        pcm = (8000 * np.sin(2 * np.pi * 10000 * t)).astype(np.int16)
+
+        resampled = resample_pcm(pcm, 48000, 16000)
+
+        assert np.abs(resampled[100:-100]).max() < 800
+
+    def test_same_rate_is_passthrough(self):
+        """Test matching rates return the input unchanged."""
+        pcm = np.arange(10, dtype=np.int16)
+        assert resample_pcm(pcm, 16000, 16000) is pcm
+
+
+class TestProcessAudioFrame:
+    """Test frame conversion and gain."""
+
+    def _frame(self, samples):
+        return av.AudioFrame.from_ndarray(
+            np.array([samples], dtype=np.int16), format="s16", layout="mono"
+        )
+
+    def test_integer_gain_saturates_without_wrapping(self):
+        """Test 2x gain doubles quiet samples and clips loud ones."""
+        pcm = process_audio_frame(self._frame([-30000, -100, 0, 100, 30000]), gain=2.0)
+
+        assert pcm.dtype == np.int16
+        assert pcm[1:4].tolist() == [-200, 0, 200]
+        assert pcm[0] == -32768
+        assert pcm[4] >= 32766
+
+    @pytest.mark.parametrize("gain", [3.0, 5.0, 6.0])
+    def test_integer_gain_not_dividing_full_scale_keeps_sign(self, gain):
+        """Test gains that do not divide 32768 saturate like the float path."""
+        samples = [-32768, -32767, -20000, -100, 0, 100, 20000, 32767]
+        reference = np.clip(np.array(samples, dtype=np.float64) * gain, -32768, 32767)
+
+        pcm = process_audio_frame(self._frame(samples), gain=gain)
+
+        assert pcm.dtype == np.int16
+        assert np.sign(pcm).tolist() == np.sign(reference).tolist()
+        # Saturated samples may sit a few LSB short of full scale
+        assert np.abs(pcm - reference).max() <= gain
+
+    def test_fractional_gain(self):
+        """Test non-integer gain goes through the float path."""
+        pcm = process_audio_frame(self._frame([-1000, 1000, 30000]), gain=1.5)
+
+        assert pcm.tolist() == [-1500, 1500, 32767]
+
+
+class TestIsVoicedChunk:
+    """Test the RMS plus amplitude-density VAD."""
+
+    def test_silence_is_rejected(self):
+        """Test low-level noise fails the RMS gate."""
+        pcm = np.full(4800, 50, dtype=np.int16)
+        assert not is_voiced_chunk(pcm, 300, min_density=0.12, amplitude_gate=1100)
+
+    def test_sparse_clicks_are_rejected(self):
+        """Test a few loud samples pass RMS but fail the density gate."""
+        pcm = np.zeros(4800, dtype=np.int16)
+        pcm[::100] = -32768
+        assert not is_voiced_chunk(pcm, 300, min_density=0.12, amplitude_gate=1100)
+
+    def test_speech_level_signal_is_accepted(self):
+        """Test a sustained tone counts both positive and negative peaks."""
+        t = np.arange(4800) / 48000
+        pcm = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+        assert is_voiced_chunk(pcm, 300, min_density=0.12, amplitude_gate=1100)
+        assert not is_voiced_chunk(pcm, 300, min_density=0.12, amplitude_gate=1100, rms=0.0)
+
+
+class TestFindQuietSplit:
+    """Test choosing a chunk boundary inside a pause."""
+
+    def test_splits_in_pause(self):
+        """Test the split lands in a silent gap near the end."""
+        t = np.arange(48000) / 48000
+        pcm = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+        pcm[44160:45120] = 0  # 20 ms pause at 0.92 s
+        split = find_quiet_split(pcm, 48000)
+        assert 44160 <= split < 45120
+
+    def test_keeps_whole_chunk_without_pause(self):
+        """Test continuous speech-level audio is not cut short."""
+        t = np.arange(48000) / 48000
+        pcm = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+        assert find_quiet_split(pcm, 48000) == len(pcm)
+
+    def test_short_input_is_kept(self):
+        """Test input shorter than one frame is returned whole."""
+        pcm = np.zeros(100, dtype=np.int16)
+        assert find_quiet_split(pcm, 48000) == 100
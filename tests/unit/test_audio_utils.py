@@ -0,0 +1,69 @@
+"""Unit tests for audio utilities."""
+import math
+import struct
+
+import numpy as np
+import pytest
+
+from src.utils.audio_utils import (
+    WAV_HEADER_SIZE,
+    build_wav_header,
+    calculate_rms,
+    sum_of_squares,
+)
+
+
+class TestCalculateRms:
+    """Test RMS calculation."""
+
+    def test_empty_input_returns_zero(self):
+        """Test empty array returns 0.0."""
+        assert calculate_rms(np.array([], dtype=np.int16)) == 0.0
+
+    def test_known_values(self):
+        """Test RMS of a small known sample set."""
+        pcm = np.array([100, -200, 300, -400], dtype=np.int16)
+        assert calculate_rms(pcm) == pytest.approx(273.861, abs=1e-3)
+
+    def test_full_scale_chunk_does_not_overflow(self):
+        """Test a long full-scale chunk keeps the exact RMS."""
+        pcm = np.full(48000 * 3, -32768, dtype=np.int16)
+        assert calculate_rms(pcm) == pytest.approx(32768.0)
+
+    def test_matches_reference_formula(self):
+        """Test result matches sqrt(mean(x**2)) on random audio."""
+        rng = np.random.default_rng(0)
+        pcm = rng.integers(-32768, 32768, size=4800, dtype=np.int16)
+        expected = np.sqrt(np.mean(pcm.astype(np.float64) ** 2))
+        assert calculate_rms(pcm) == pytest.approx(expected)
+
+
+class TestSumOfSquares:
+    """Test the accumulator used for running RMS."""
+
+    def test_exact_for_full_scale_frame(self):
+        """Test a full-scale frame sums exactly without overflow."""
+        pcm = np.full(960, -32768, dtype=np.int16)
+        assert sum_of_squares(pcm) == 960 * 32768 ** 2
+
+    def test_accumulated_frames_match_calculate_rms(self):
+        """Test summing per-frame totals gives the RMS of the whole."""
+        rng = np.random.default_rng(0)
+        pcm = rng.integers(-20000, 20000, size=960 * 10, dtype=np.int16)
+
+        total = sum(sum_of_squares(pcm[i:i + 960]) for i in range(0, pcm.size, 960))
+
+        assert math.sqrt(total / pcm.size) == pytest.approx(calculate_rms(pcm))
+
+
+class TestBuildWavHeader:
+    """Test WAV header construction."""
+
+    def test_header_fields(self):
+        """Test header encodes sizes and mono 16-bit format."""
+        header = build_wav_header(6, 48000)
+        assert len(header) == WAV_HEADER_SIZE
+        assert header[:4] == b"RIFF"
+        assert struct.unpack_from("<I", header, 4)[0] == 42
+        assert struct.unpack_from("<HHIIHH", header, 20) == (1, 1, 48000, 96000, 2, 16)
+        assert struct.unpack_from("<I", header, 40)[0] == 6
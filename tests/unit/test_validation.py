@@ -25,6 +25,13 @@ class TestValidateDateFormat:
         with pytest.raises(ValueError, match="Invalid date value"):
             validate_date_format("2025-13-01")
 
+    def test_invalid_date_value_keeps_strptime_message(self):
+        """Test out-of-range dates still report strptime's reason."""
+        with pytest.raises(ValueError, match="does not match format '%Y-%m-%d'"):
+            validate_date_format("2025-13-01")
+        with pytest.raises(ValueError, match="day is out of range for month"):
+            validate_date_format("2025-02-29")
+
     def test_non_string_raises_error(self):
         """Test non-string input raises ValueError."""
         with pytest.raises(ValueError, match="Date must be a string"):
@@ -58,6 +65,11 @@ class TestValidateTimeFormat:
         with pytest.raises(ValueError, match="Invalid time value"):
             validate_time_format("25:00-26:00")
 
+    def test_invalid_minute_keeps_strptime_message(self):
+        """Test a 60th minute still reports strptime's leftover-data error."""
+        with pytest.raises(ValueError, match="unconverted data remains"):
+            validate_time_format("12:60-13:00")
+
     def test_non_string_raises_error(self):
         """Test non-string input raises ValueError."""
         with pytest.raises(ValueError, match="Time must be a string"):